@@ -1,16 +1,77 @@
-import yfinance as yf
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from datetime import datetime, timedelta
 import warnings
-import time
-import json
+import sys
 import os
 from mean_reversion_algorithms import MeanReversionAlgorithms
 from momentum_algorithms import MomentumAlgorithms
+from price_history import download_price_history
+from numba_compat import NUMBA_AVAILABLE, njit, prange
 warnings.filterwarnings('ignore')
 
+# Strategy labels; the fused kernel emits the index into this tuple
+STRATEGY_TYPES = ('CONSENSUS', 'MOMENTUM', 'MEAN_REVERSION', 'CONTRARIAN', 'WEAK')
+
+# Resolution of the saved dashboard; the email shows it at most 800px wide, so 150 dpi (3600px) is
+# plenty and encodes far faster than 300
+CHART_DPI = 150
+
+# Universe size from which the fused kernel pays for its JIT compile; smaller
+# universes use the NumPy np.select path
+NUMBA_MIN_SYMBOLS = 10_000
+
+@njit(inline='always')
+def _combine_pair(mr, mom):
+    """Scalar combined signal for one side (buy or sell); mirrors calculate_combined_*_signal"""
+    if mr > 0.5 and mom > 0.5:
+        return (mr + mom) / 2 * 1.2
+    elif mom > 0.7 and mr > 0.2:
+        return mom * 0.8 + mr * 0.2
+    elif mr > 0.7 and mom > 0.1:
+        return mr * 0.8 + mom * 0.2
+    elif mr > 0.6 or mom > 0.6:
+        return max(mr, mom) * 0.8
+    return (mr + mom) / 2 * 0.6
+
+@njit(parallel=True, fastmath=True, cache=True)
+def combine_kernel(mr_b, mr_s, mom_b, mom_s, out_b, out_s, out_conf, out_code, out_strength):
+    """Fused single pass computing combined signals, strategy code, confidence and strength"""
+    for i in prange(mr_b.shape[0]):
+        b = _combine_pair(mr_b[i], mom_b[i])
+        s = _combine_pair(mr_s[i], mom_s[i])
+        out_b[i] = b
+        out_s[i] = s
+        out_strength[i] = max(b, s)
+        
+        max_mr = max(mr_b[i], mr_s[i])
+        max_mom = max(mom_b[i], mom_s[i])
+        max_all = max(max_mr, max_mom)
+        agree = (mr_b[i] > 0.5 and mom_b[i] > 0.5) or (mr_s[i] > 0.5 and mom_s[i] > 0.5)
+        
+        # Strategy type (see determine_strategy_type)
+        if agree:
+            out_code[i] = 0
+        elif max_mom > max_mr and max_mom > 0.5:
+            out_code[i] = 1
+        elif max_mr > max_mom and max_mr > 0.5:
+            out_code[i] = 2
+        elif (mr_b[i] > 0.4 and mom_s[i] > 0.4) or (mr_s[i] > 0.4 and mom_b[i] > 0.4):
+            out_code[i] = 3
+        else:
+            out_code[i] = 4
+        
+        # Confidence (see calculate_confidence_score)
+        if agree:
+            out_conf[i] = 0.9
+        elif max_all > 0.7:
+            out_conf[i] = 0.75
+        elif max_all > 0.5:
+            out_conf[i] = 0.6
+        elif (mr_b[i] > 0.3 and mom_s[i] > 0.3) or (mr_s[i] > 0.3 and mom_b[i] > 0.3):
+            out_conf[i] = 0.4
+        else:
+            out_conf[i] = 0.3
+
 class CombinedStrategyAnalysis:
     def __init__(self, lookback_days=252, num_stocks=100):
         self.lookback_days = lookback_days
@@ -21,6 +82,9 @@ class CombinedStrategyAnalysis:
         self.mean_reversion_analyzer = MeanReversionAlgorithms(lookback_days, num_stocks)
         self.momentum_analyzer = MomentumAlgorithms(lookback_days, num_stocks)
         
+        # Price history shared by both analyzers ({symbol: Close/Volume DataFrame}, see price_history.PRICE_COLUMNS)
+        self.price_cache = None
+        
         # Results storage
         self.combined_signals_df = None
         
@@ -31,13 +95,23 @@ class CombinedStrategyAnalysis:
         print("🚀 COMBINED STRATEGY ANALYSIS: Mean Reversion + Momentum")
         print("=" * 80)
         
+        # Resolve the stock universe once and share it with both analyzers
+        symbols = self.mean_reversion_analyzer.fetch_dynamic_stock_list(force_refresh=force_refresh_stocks)
+        self.momentum_analyzer.popular_stocks = symbols
+        
+        # Download price history once for both strategies instead of once per analyzer per symbol
+        print("\n⬇️ Prefetching price history...")
+        self.price_cache = self._prefetch_prices(symbols)
+        self.mean_reversion_analyzer.price_cache = self.price_cache
+        self.momentum_analyzer.price_cache = self.price_cache
+        
         # Run mean reversion analysis (silently to avoid duplicate output)
         print("\n📈 Running Mean Reversion Analysis...")
-        mr_buy_signals, mr_sell_signals = self.mean_reversion_analyzer.run_analysis(force_refresh_stocks, silent=True)
+        mr_buy_signals, mr_sell_signals = self.mean_reversion_analyzer.run_analysis(silent=True)
         
         # Run momentum analysis (silently to avoid duplicate output)
         print("\n📊 Running Momentum Analysis...")
-        mom_buy_signals, mom_sell_signals = self.momentum_analyzer.run_momentum_analysis(force_refresh_stocks, silent=True)
+        mom_buy_signals, mom_sell_signals = self.momentum_analyzer.run_momentum_analysis(silent=True)
         
         # Combine the results
         print("\n🔄 Combining Strategy Results...")
@@ -45,172 +119,183 @@ class CombinedStrategyAnalysis:
         
         return self.combined_signals_df
     
-    def combine_strategies(self, mr_buy, mr_sell, mom_buy, mom_sell):
-        """Combine mean reversion and momentum signals"""
+    def _prefetch_prices(self, symbols):
+        """Fetch price history for the whole universe in one bulk multi-ticker request (incrementally cached)"""
+        # Cover the widest window either analyzer needs; each slices its own start date
+        start_date = min(self.mean_reversion_analyzer.start_date, self.momentum_analyzer.start_date)
+        end_date = max(self.mean_reversion_analyzer.end_date, self.momentum_analyzer.end_date)
         
-        # Get all unique symbols
-        all_symbols = set()
-        all_symbols.update(mr_buy['Symbol'].tolist())
-        all_symbols.update(mr_sell['Symbol'].tolist())
-        all_symbols.update(mom_buy['Symbol'].tolist())
-        all_symbols.update(mom_sell['Symbol'].tolist())
+        price_cache = download_price_history(symbols, start_date, end_date,
+                                             cache_dir=os.path.join(self.output_dir, 'prices'))
         
-        combined_results = []
+        print(f"Prefetched price history for {len(price_cache)}/{len(symbols)} stocks")
+        return price_cache
+    
+    def combine_strategies(self, mr_buy, mr_sell, mom_buy, mom_sell):
+        """Combine mean reversion and momentum signals"""
         
-        for symbol in all_symbols:
-            # Get mean reversion signals
-            mr_buy_row = mr_buy[mr_buy['Symbol'] == symbol]
-            mr_sell_row = mr_sell[mr_sell['Symbol'] == symbol]
-            
-            mr_buy_strength = mr_buy_row['Buy_Signal_Strength'].iloc[0] if len(mr_buy_row) > 0 else 0
-            mr_sell_strength = mr_sell_row['Sell_Signal_Strength'].iloc[0] if len(mr_sell_row) > 0 else 0
-            
-            # Get momentum signals
-            mom_buy_row = mom_buy[mom_buy['Symbol'] == symbol]
-            mom_sell_row = mom_sell[mom_sell['Symbol'] == symbol]
-            
-            mom_buy_strength = mom_buy_row['Momentum_Buy_Signal'].iloc[0] if len(mom_buy_row) > 0 else 0
-            mom_sell_strength = mom_sell_row['Momentum_Sell_Signal'].iloc[0] if len(mom_sell_row) > 0 else 0
-            
-            # Get current price (from either dataset)
-            current_price = 0
-            rsi = 0
-            if len(mr_buy_row) > 0:
-                current_price = mr_buy_row['Current_Price'].iloc[0]
-                rsi = mr_buy_row['RSI'].iloc[0]
-            elif len(mr_sell_row) > 0:
-                current_price = mr_sell_row['Current_Price'].iloc[0]
-                rsi = mr_sell_row['RSI'].iloc[0]
-            elif len(mom_buy_row) > 0:
-                current_price = mom_buy_row['Current_Price'].iloc[0]
-                rsi = mom_buy_row['RSI'].iloc[0]
-            elif len(mom_sell_row) > 0:
-                current_price = mom_sell_row['Current_Price'].iloc[0]
-                rsi = mom_sell_row['RSI'].iloc[0]
+        # Align all four signal sets on Symbol. Price and RSI come from the first
+        # dataset containing the symbol (MR buy, MR sell, Mom buy, Mom sell);
+        # a symbol missing from a dataset has zero strength there.
+        sources = [
+            (mr_buy, 'Buy_Signal_Strength', 'MR_Buy_Signal'),
+            (mr_sell, 'Sell_Signal_Strength', 'MR_Sell_Signal'),
+            (mom_buy, 'Momentum_Buy_Signal', 'Mom_Buy_Signal'),
+            (mom_sell, 'Momentum_Sell_Signal', 'Mom_Sell_Signal'),
+        ]
+        aligned = None
+        for signals, source_col, signal_col in sources:
+            frame = (signals.drop_duplicates('Symbol')
+                            .set_index('Symbol')[['Current_Price', 'RSI', source_col]]
+                            .rename(columns={source_col: signal_col}))
+            aligned = frame if aligned is None else aligned.combine_first(frame)
+        
+        mr_buy_strength = aligned['MR_Buy_Signal'].fillna(0).to_numpy(dtype=float)
+        mr_sell_strength = aligned['MR_Sell_Signal'].fillna(0).to_numpy(dtype=float)
+        mom_buy_strength = aligned['Mom_Buy_Signal'].fillna(0).to_numpy(dtype=float)
+        mom_sell_strength = aligned['Mom_Sell_Signal'].fillna(0).to_numpy(dtype=float)
+        
+        if NUMBA_AVAILABLE and len(aligned) >= NUMBA_MIN_SYMBOLS:
+            (combined_buy_signal, combined_sell_signal, strategy_type,
+             confidence, signal_strength) = self._combine_fused(mr_buy_strength, mr_sell_strength,
+                                                                mom_buy_strength, mom_sell_strength)
+        else:
+            # Per-strategy maxima, computed once and shared by the strategy type and confidence rules
+            max_mr = np.maximum(mr_buy_strength, mr_sell_strength)
+            max_mom = np.maximum(mom_buy_strength, mom_sell_strength)
+            max_all = np.maximum(max_mr, max_mom)
             
             # Calculate combined signals
             combined_buy_signal = self.calculate_combined_buy_signal(mr_buy_strength, mom_buy_strength)
             combined_sell_signal = self.calculate_combined_sell_signal(mr_sell_strength, mom_sell_strength)
+            signal_strength = np.maximum(combined_buy_signal, combined_sell_signal)
             
             # Determine strategy recommendation
-            strategy_type = self.determine_strategy_type(mr_buy_strength, mr_sell_strength, 
-                                                       mom_buy_strength, mom_sell_strength)
+            strategy_type = self.determine_strategy_type(mr_buy_strength, mr_sell_strength,
+                                                         mom_buy_strength, mom_sell_strength,
+                                                         max_mr=max_mr, max_mom=max_mom)
             
             # Calculate confidence score
             confidence = self.calculate_confidence_score(mr_buy_strength, mr_sell_strength,
-                                                       mom_buy_strength, mom_sell_strength)
-            
-            combined_results.append({
-                'Symbol': symbol,
-                'Current_Price': current_price,
-                'RSI': rsi,
-                'MR_Buy_Signal': mr_buy_strength,
-                'MR_Sell_Signal': mr_sell_strength,
-                'Mom_Buy_Signal': mom_buy_strength,
-                'Mom_Sell_Signal': mom_sell_strength,
-                'Combined_Buy_Signal': combined_buy_signal,
-                'Combined_Sell_Signal': combined_sell_signal,
-                'Strategy_Type': strategy_type,
-                'Confidence_Score': confidence,
-                'Signal_Strength': max(combined_buy_signal, combined_sell_signal)
-            })
-        
-        self.combined_signals_df = pd.DataFrame(combined_results)
+                                                         mom_buy_strength, mom_sell_strength,
+                                                         max_all=max_all)
+        
+        self.combined_signals_df = pd.DataFrame({
+            'Symbol': aligned.index.to_numpy(),
+            'Current_Price': aligned['Current_Price'].fillna(0).to_numpy(),
+            'RSI': aligned['RSI'].fillna(0).to_numpy(),
+            'MR_Buy_Signal': mr_buy_strength,
+            'MR_Sell_Signal': mr_sell_strength,
+            'Mom_Buy_Signal': mom_buy_strength,
+            'Mom_Sell_Signal': mom_sell_strength,
+            'Combined_Buy_Signal': combined_buy_signal,
+            'Combined_Sell_Signal': combined_sell_signal,
+            'Strategy_Type': strategy_type,
+            'Confidence_Score': confidence,
+            'Signal_Strength': signal_strength
+        })
         
         # Generate comprehensive report
         self.generate_combined_report()
         
         return self.combined_signals_df
     
+    def _combine_fused(self, mr_buy, mr_sell, mom_buy, mom_sell):
+        """Run combine_kernel over aligned signal arrays (large universes only)"""
+        n = len(mr_buy)
+        combined_buy = np.empty(n)
+        combined_sell = np.empty(n)
+        confidence = np.empty(n)
+        strategy_code = np.empty(n, dtype=np.int8)
+        signal_strength = np.empty(n)
+        
+        combine_kernel(mr_buy, mr_sell, mom_buy, mom_sell,
+                       combined_buy, combined_sell, confidence, strategy_code, signal_strength)
+        
+        strategy_type = np.array(STRATEGY_TYPES)[strategy_code]
+        return combined_buy, combined_sell, strategy_type, confidence, signal_strength
+    
     def calculate_combined_buy_signal(self, mr_buy, mom_buy):
-        """Calculate combined buy signal strength"""
-        # Strategy 1: Both strategies agree (strongest signal)
-        if mr_buy > 0.5 and mom_buy > 0.5:
-            return (mr_buy + mom_buy) / 2 * 1.2  # Boost when both agree
-        
-        # Strategy 2: Momentum breakout with mean reversion support
-        elif mom_buy > 0.7 and mr_buy > 0.2:
-            return mom_buy * 0.8 + mr_buy * 0.2
-        
-        # Strategy 3: Strong mean reversion with some momentum
-        elif mr_buy > 0.7 and mom_buy > 0.1:
-            return mr_buy * 0.8 + mom_buy * 0.2
-        
-        # Strategy 4: Individual strong signals
-        elif mr_buy > 0.6 or mom_buy > 0.6:
-            return max(mr_buy, mom_buy) * 0.8
-        
+        """Calculate combined buy signal strength (element-wise over arrays)"""
+        conditions = [
+            # Strategy 1: Both strategies agree (strongest signal)
+            (mr_buy > 0.5) & (mom_buy > 0.5),
+            # Strategy 2: Momentum breakout with mean reversion support
+            (mom_buy > 0.7) & (mr_buy > 0.2),
+            # Strategy 3: Strong mean reversion with some momentum
+            (mr_buy > 0.7) & (mom_buy > 0.1),
+            # Strategy 4: Individual strong signals
+            (mr_buy > 0.6) | (mom_buy > 0.6),
+        ]
+        choices = [
+            (mr_buy + mom_buy) / 2 * 1.2,  # Boost when both agree
+            mom_buy * 0.8 + mr_buy * 0.2,
+            mr_buy * 0.8 + mom_buy * 0.2,
+            np.maximum(mr_buy, mom_buy) * 0.8,
+        ]
         # Weak signals
-        else:
-            return (mr_buy + mom_buy) / 2 * 0.6
+        return np.select(conditions, choices, default=(mr_buy + mom_buy) / 2 * 0.6)
     
     def calculate_combined_sell_signal(self, mr_sell, mom_sell):
-        """Calculate combined sell signal strength"""
-        # Strategy 1: Both strategies agree (strongest signal)
-        if mr_sell > 0.5 and mom_sell > 0.5:
-            return (mr_sell + mom_sell) / 2 * 1.2  # Boost when both agree
-        
-        # Strategy 2: Momentum breakdown with mean reversion resistance
-        elif mom_sell > 0.7 and mr_sell > 0.2:
-            return mom_sell * 0.8 + mr_sell * 0.2
-        
-        # Strategy 3: Strong mean reversion with some momentum
-        elif mr_sell > 0.7 and mom_sell > 0.1:
-            return mr_sell * 0.8 + mom_sell * 0.2
-        
-        # Strategy 4: Individual strong signals
-        elif mr_sell > 0.6 or mom_sell > 0.6:
-            return max(mr_sell, mom_sell) * 0.8
-        
+        """Calculate combined sell signal strength (element-wise over arrays)"""
+        conditions = [
+            # Strategy 1: Both strategies agree (strongest signal)
+            (mr_sell > 0.5) & (mom_sell > 0.5),
+            # Strategy 2: Momentum breakdown with mean reversion resistance
+            (mom_sell > 0.7) & (mr_sell > 0.2),
+            # Strategy 3: Strong mean reversion with some momentum
+            (mr_sell > 0.7) & (mom_sell > 0.1),
+            # Strategy 4: Individual strong signals
+            (mr_sell > 0.6) | (mom_sell > 0.6),
+        ]
+        choices = [
+            (mr_sell + mom_sell) / 2 * 1.2,  # Boost when both agree
+            mom_sell * 0.8 + mr_sell * 0.2,
+            mr_sell * 0.8 + mom_sell * 0.2,
+            np.maximum(mr_sell, mom_sell) * 0.8,
+        ]
         # Weak signals
-        else:
-            return (mr_sell + mom_sell) / 2 * 0.6
+        return np.select(conditions, choices, default=(mr_sell + mom_sell) / 2 * 0.6)
     
-    def determine_strategy_type(self, mr_buy, mr_sell, mom_buy, mom_sell):
-        """Determine the primary strategy type for the signal"""
-        
-        # Both strategies strongly agree
-        if (mr_buy > 0.5 and mom_buy > 0.5) or (mr_sell > 0.5 and mom_sell > 0.5):
-            return "CONSENSUS"
-        
-        # Momentum dominant
-        elif max(mom_buy, mom_sell) > max(mr_buy, mr_sell) and max(mom_buy, mom_sell) > 0.5:
-            return "MOMENTUM"
-        
-        # Mean reversion dominant
-        elif max(mr_buy, mr_sell) > max(mom_buy, mom_sell) and max(mr_buy, mr_sell) > 0.5:
-            return "MEAN_REVERSION"
-        
-        # Contrarian (momentum and mean reversion disagree)
-        elif (mr_buy > 0.4 and mom_sell > 0.4) or (mr_sell > 0.4 and mom_buy > 0.4):
-            return "CONTRARIAN"
-        
+    def determine_strategy_type(self, mr_buy, mr_sell, mom_buy, mom_sell, max_mr=None, max_mom=None):
+        """Determine the primary strategy type for each signal"""
+        if max_mr is None:
+            max_mr = np.maximum(mr_buy, mr_sell)
+        if max_mom is None:
+            max_mom = np.maximum(mom_buy, mom_sell)
+        
+        conditions = [
+            # Both strategies strongly agree
+            ((mr_buy > 0.5) & (mom_buy > 0.5)) | ((mr_sell > 0.5) & (mom_sell > 0.5)),
+            # Momentum dominant
+            (max_mom > max_mr) & (max_mom > 0.5),
+            # Mean reversion dominant
+            (max_mr > max_mom) & (max_mr > 0.5),
+            # Contrarian (momentum and mean reversion disagree)
+            ((mr_buy > 0.4) & (mom_sell > 0.4)) | ((mr_sell > 0.4) & (mom_buy > 0.4)),
+        ]
+        choices = ['CONSENSUS', 'MOMENTUM', 'MEAN_REVERSION', 'CONTRARIAN']
         # Weak signals
-        else:
-            return "WEAK"
+        return np.select(conditions, choices, default='WEAK')
     
-    def calculate_confidence_score(self, mr_buy, mr_sell, mom_buy, mom_sell):
-        """Calculate confidence score for the combined signal"""
-        
-        # High confidence when both strategies agree
-        if (mr_buy > 0.5 and mom_buy > 0.5) or (mr_sell > 0.5 and mom_sell > 0.5):
-            return 0.9
-        
-        # Medium-high confidence for strong individual signals
-        elif max(mr_buy, mr_sell, mom_buy, mom_sell) > 0.7:
-            return 0.75
-        
-        # Medium confidence for moderate signals
-        elif max(mr_buy, mr_sell, mom_buy, mom_sell) > 0.5:
-            return 0.6
-        
-        # Lower confidence for contrarian signals
-        elif (mr_buy > 0.3 and mom_sell > 0.3) or (mr_sell > 0.3 and mom_buy > 0.3):
-            return 0.4
-        
+    def calculate_confidence_score(self, mr_buy, mr_sell, mom_buy, mom_sell, max_all=None):
+        """Calculate confidence score for each combined signal"""
+        if max_all is None:
+            max_all = np.maximum(np.maximum(mr_buy, mr_sell), np.maximum(mom_buy, mom_sell))
+        
+        conditions = [
+            # High confidence when both strategies agree
+            ((mr_buy > 0.5) & (mom_buy > 0.5)) | ((mr_sell > 0.5) & (mom_sell > 0.5)),
+            # Medium-high confidence for strong individual signals
+            max_all > 0.7,
+            # Medium confidence for moderate signals
+            max_all > 0.5,
+            # Lower confidence for contrarian signals
+            ((mr_buy > 0.3) & (mom_sell > 0.3)) | ((mr_sell > 0.3) & (mom_buy > 0.3)),
+        ]
+        choices = [0.9, 0.75, 0.6, 0.4]
         # Low confidence for weak signals
-        else:
-            return 0.3
+        return np.select(conditions, choices, default=0.3)
     
     def generate_combined_report(self):
         """Generate comprehensive combined strategy report"""
@@ -259,11 +344,12 @@ class CombinedStrategyAnalysis:
         
         # Strategy distribution
         strategy_counts = self.combined_signals_df['Strategy_Type'].value_counts()
+        percentages = (strategy_counts / len(self.combined_signals_df) * 100).round(1)
         print(f"\n📊 STRATEGY DISTRIBUTION:")
         print("-" * 40)
-        for strategy, count in strategy_counts.items():
-            percentage = (count / len(self.combined_signals_df)) * 100
-            print(f"{strategy}: {count} stocks ({percentage:.1f}%)")
+        distribution = pd.DataFrame({'Stocks': strategy_counts, 'Percent': percentages})
+        distribution.index.name = None
+        print(distribution.to_string())
         
         # Save results
         self.save_combined_results(consensus_signals, momentum_signals, mean_reversion_signals, contrarian_signals)
@@ -279,6 +365,11 @@ class CombinedStrategyAnalysis:
         
         # Save complete combined results
         self.combined_signals_df.to_csv(os.path.join(self.output_dir, 'combined_strategy_analysis.csv'), index=False)
+        # Parquet copy for the email report, which reads it instead of reparsing the CSV
+        try:
+            self.combined_signals_df.to_parquet(os.path.join(self.output_dir, 'combined_strategy_analysis.parquet'), index=False)
+        except (ImportError, ValueError, OSError):
+            pass
         
         print(f"\n💾 RESULTS SAVED:")
         print(f"- Consensus signals: consensus_signals.csv")
@@ -292,6 +383,11 @@ class CombinedStrategyAnalysis:
         if self.combined_signals_df is None:
             return
         
+        # Imported lazily so the analysis path never pays for pyplot/backend initialization
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        
         fig, axes = plt.subplots(2, 3, figsize=(24, 16))
         
         # Get top buy and sell signals
@@ -435,8 +531,8 @@ class CombinedStrategyAnalysis:
         
         plt.tight_layout()
         output_path = os.path.join(self.output_dir, 'combined_strategy_analysis.png')
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.show()
+        plt.savefig(output_path, dpi=CHART_DPI, bbox_inches='tight')
+        plt.close(fig)
         
         print(f"\n📊 Visualization saved: {output_path}")
         
@@ -459,8 +555,6 @@ class CombinedStrategyAnalysis:
 
 def main():
     """Main function for combined strategy analysis"""
-    import sys
-    
     force_refresh = '--refresh' in sys.argv
     
     if force_refresh:
@@ -1,29 +1,79 @@
 import yfinance as yf
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 import json
 import time
 import os
+from functools import lru_cache
 from datetime import datetime, timedelta
+from io import StringIO
+from price_history import yahoo_session
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Connection pool size for the session the index and Yahoo pages are scraped with
+SCRAPE_POOL_SIZE = 20
+
+# Seconds a saved stock list stays current; older lists are re-scraped even without --refresh
+STOCK_LIST_TTL = 24 * 60 * 60
+
+def is_stock_list_fresh(filepath, ttl=STOCK_LIST_TTL):
+    """True if the stock list file exists and was written less than ttl seconds ago"""
+    try:
+        return time.time() - os.path.getmtime(filepath) < ttl
+    except OSError:
+        return False
+
+@lru_cache(maxsize=4)
+def _read_stock_symbols(filepath, num_stocks, mtime_ns, size):
+    """Parse the first num_stocks symbols from a stock list file; mtime/size key the cache to the file's version"""
+    if ORJSON_AVAILABLE:
+        with open(filepath, 'rb') as f:
+            stocks_data = orjson.loads(f.read())
+    else:
+        with open(filepath, 'r') as f:
+            stocks_data = json.load(f)
+    return tuple(stock['symbol'] for stock in stocks_data[:num_stocks])
+
+def load_stock_symbols(filepath, num_stocks):
+    """First num_stocks symbols from a saved stock list, parsed once per file version"""
+    stat = os.stat(filepath)
+    return list(_read_stock_symbols(filepath, num_stocks, stat.st_mtime_ns, stat.st_size))
+
 class DynamicStockFetcher:
     def __init__(self):
         self.all_stocks = []
         self.stock_metrics = {}
         self.output_dir = 'output'
+        # Page scrapes share one pooled session so connections (and TLS handshakes) are reused
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=SCRAPE_POOL_SIZE, pool_maxsize=SCRAPE_POOL_SIZE)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         
         # Create output directory if it doesn't exist
         os.makedirs(self.output_dir, exist_ok=True)
+    
+    def read_html_tables(self, url):
+        """Parse every HTML table on a page fetched through the shared session"""
+        response = self.session.get(url, timeout=10)
+        response.raise_for_status()
+        return pd.read_html(StringIO(response.text))
         
     def get_sp500_stocks(self):
         """Fetch S&P 500 stocks from Wikipedia"""
         print("Fetching S&P 500 stocks...")
         try:
             url = 'https://en.wikipedia.org/wiki/List_of_S%26P_500_companies'
-            tables = pd.read_html(url)
+            tables = self.read_html_tables(url)
             sp500_df = tables[0]
             symbols = sp500_df['Symbol'].tolist()
             return [(symbol, 'SP500') for symbol in symbols]
@@ -36,7 +86,7 @@ class DynamicStockFetcher:
         print("Fetching NASDAQ 100 stocks...")
         try:
             url = 'https://en.wikipedia.org/wiki/Nasdaq-100'
-            tables = pd.read_html(url)
+            tables = self.read_html_tables(url)
             nasdaq_df = tables[4]  # The main table is usually the 5th table
             symbols = nasdaq_df['Ticker'].tolist()
             return [(symbol, 'NASDAQ100') for symbol in symbols]
@@ -49,7 +99,7 @@ class DynamicStockFetcher:
         print("Fetching Dow Jones stocks...")
         try:
             url = 'https://en.wikipedia.org/wiki/Dow_Jones_Industrial_Average'
-            tables = pd.read_html(url)
+            tables = self.read_html_tables(url)
             dow_df = tables[1]  # Companies table
             symbols = dow_df['Symbol'].tolist()
             return [(symbol, 'DOW') for symbol in symbols]
@@ -67,7 +117,7 @@ class DynamicStockFetcher:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
             
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self.session.get(url, headers=headers, timeout=10)
             soup = BeautifulSoup(response.text, 'html.parser')
             
             # Look for stock symbols in the page
@@ -124,7 +174,7 @@ class DynamicStockFetcher:
             for etf in etf_symbols:
                 try:
                     # Get ETF info
-                    etf_ticker = yf.Ticker(etf)
+                    etf_ticker = yf.Ticker(etf, session=yahoo_session())
                     
                     # Try to get holdings (this might not work for all ETFs)
                     # For now, we'll skip this and rely on other sources
@@ -176,7 +226,7 @@ class DynamicStockFetcher:
     def calculate_popularity_score(self, symbol):
         """Calculate popularity score based on multiple factors"""
         try:
-            stock = yf.Ticker(symbol)
+            stock = yf.Ticker(symbol, session=yahoo_session())
             info = stock.info
             
             # Get recent data
@@ -343,10 +393,61 @@ class DynamicStockFetcher:
     def save_to_file(self, stocks, filename='top_stocks.json'):
         """Save the stock list to a JSON file"""
         filepath = os.path.join(self.output_dir, filename)
-        with open(filepath, 'w') as f:
-            json.dump(stocks, f, indent=2, default=str)
+        if ORJSON_AVAILABLE:
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(stocks, option=orjson.OPT_INDENT_2, default=str))
+        else:
+            with open(filepath, 'w') as f:
+                json.dump(stocks, f, indent=2, default=str)
         print(f"\nSaved top stocks to {filepath}")
     
+    def load_saved_symbols(self, filepath, num_stocks):
+        """First num_stocks symbols of a saved stock list, or None if it cannot be read"""
+        print(f"Loading existing stock list from {filepath}...")
+        try:
+            # Parsed once per file version, so the strategies in a combined run share it
+            symbols = load_stock_symbols(filepath, num_stocks)
+        except Exception as e:
+            print(f"Error loading from {filepath}: {e}")
+            return None
+        print(f"Loaded {len(symbols)} stocks from existing file")
+        print(f"Top 10 stocks: {symbols[:10]}")
+        return symbols or None
+    
+    def fetch_dynamic_stock_list(self, num_stocks=100, force_refresh=False, filename='top_stocks.json'):
+        """Symbols of the top num_stocks stocks: the saved list while it is under 24h old, otherwise
+        (or when force_refresh is set) a fresh scrape that is saved for later runs"""
+        filepath = os.path.join(self.output_dir, filename)
+        if not force_refresh:
+            if is_stock_list_fresh(filepath):
+                symbols = self.load_saved_symbols(filepath, num_stocks)
+                if symbols:
+                    return symbols
+            elif os.path.exists(filepath):
+                print(f"{filepath} is more than 24h old - refreshing it")
+            else:
+                print(f"No existing {filepath} found")
+        
+        print("Fetching fresh dynamic list of most popular stocks...")
+        print("=" * 60)
+        
+        top_stocks = self.fetch_top_stocks(num_stocks)
+        if all(stock['sources'] == ['FALLBACK'] for stock in top_stocks):
+            # Every source failed: an older scraped list beats the hardcoded fallback, and the
+            # fallback is never saved so it cannot pass for a fresh list on later runs
+            if os.path.exists(filepath):
+                print("⚠️ Scrape failed - keeping the existing stock list")
+                symbols = self.load_saved_symbols(filepath, num_stocks)
+                if symbols:
+                    return symbols
+        else:
+            # Saved so later runs within the next 24h reuse this scrape
+            self.save_to_file(top_stocks, filename)
+        symbols = self.get_stock_symbols_only(top_stocks)
+        
+        print(f"\nDynamic stock list ready: {len(symbols)} stocks")
+        return symbols
+    
     def get_stock_symbols_only(self, stocks):
         """Extract just the symbols from the stock data"""
         return [stock['symbol'] for stock in stocks]
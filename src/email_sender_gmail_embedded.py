@@ -9,128 +9,71 @@ Usage: python src/email_sender_gmail_embedded.py
 """
 
 import os
-import base64
+import io
+import sys
+import csv
+import gzip
+import mmap
+import binascii
+import shutil
+import subprocess
 import pandas as pd
 from datetime import datetime
+from string import Template
 import json
+from email.message import EmailMessage
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from dotenv import load_dotenv
+from signal_ranking import top_n_positions
 
-class GmailEmailSender:
-    def __init__(self):
-        # Load environment variables
-        load_dotenv()
-        
-        # Email configuration
-        self.to_email = os.getenv('TO_EMAIL', 'haowang228@gmail.com')
-        
-        # File paths
-        self.output_dir = 'output'
-        # Updated to use combined strategy analysis files
-        self.combined_analysis_file = os.path.join(self.output_dir, 'combined_strategy_analysis.csv')
-        self.consensus_signals_file = os.path.join(self.output_dir, 'consensus_signals.csv')
-        self.momentum_signals_file = os.path.join(self.output_dir, 'momentum_dominant_signals.csv')
-        self.mean_reversion_signals_file = os.path.join(self.output_dir, 'mean_reversion_dominant_signals.csv')
-        self.contrarian_signals_file = os.path.join(self.output_dir, 'contrarian_signals.csv')
-        self.stocks_metadata_file = os.path.join(self.output_dir, 'top_stocks.json')
-        
-        # PNG chart files - updated to use combined strategy analysis
-        self.combined_chart = os.path.join(self.output_dir, 'combined_strategy_analysis.png')
-        # Keep fallback to old charts if available
-        self.buy_chart = os.path.join(self.output_dir, 'detailed_buy_signals.png')
-        self.sell_chart = os.path.join(self.output_dir, 'detailed_sell_signals.png')
-        self.overview_chart = os.path.join(self.output_dir, 'dynamic_multi_stock_signals.png')
-    
-    def check_prerequisites(self):
-        """Check if all prerequisites are met"""
-        issues = []
-        
-        if not os.path.exists(self.combined_analysis_file):
-            issues.append(f"Combined analysis file not found: {self.combined_analysis_file}")
-        
-        if not os.path.exists(self.combined_chart):
-            issues.append(f"Combined strategy chart not found: {self.combined_chart}")
-        
-        return issues
-    
-    def load_analysis_data(self):
-        """Load the latest combined strategy analysis results"""
-        try:
-            # Load combined analysis data
-            combined_data = pd.read_csv(self.combined_analysis_file) if os.path.exists(self.combined_analysis_file) else pd.DataFrame()
-            
-            # Load individual strategy files (if available)
-            consensus_signals = pd.read_csv(self.consensus_signals_file) if os.path.exists(self.consensus_signals_file) else pd.DataFrame()
-            momentum_signals = pd.read_csv(self.momentum_signals_file) if os.path.exists(self.momentum_signals_file) else pd.DataFrame()
-            mean_reversion_signals = pd.read_csv(self.mean_reversion_signals_file) if os.path.exists(self.mean_reversion_signals_file) else pd.DataFrame()
-            contrarian_signals = pd.read_csv(self.contrarian_signals_file) if os.path.exists(self.contrarian_signals_file) else pd.DataFrame()
-            
-            # Load stock metadata
-            stock_metadata = []
-            if os.path.exists(self.stocks_metadata_file):
-                with open(self.stocks_metadata_file, 'r') as f:
-                    stock_metadata = json.load(f)
-            
-            return {
-                'combined': combined_data,
-                'consensus': consensus_signals,
-                'momentum': momentum_signals,
-                'mean_reversion': mean_reversion_signals,
-                'contrarian': contrarian_signals,
-                'metadata': stock_metadata
-            }
-            
-        except Exception as e:
-            print(f"❌ Error loading analysis data: {e}")
-            return {
-                'combined': pd.DataFrame(),
-                'consensus': pd.DataFrame(),
-                'momentum': pd.DataFrame(),
-                'mean_reversion': pd.DataFrame(),
-                'contrarian': pd.DataFrame(),
-                'metadata': []
-            }
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
 
-    def image_to_base64(self, image_path):
-        """Convert image to base64 string for HTML embedding"""
-        try:
-            with open(image_path, "rb") as img_file:
-                return base64.b64encode(img_file.read()).decode('utf-8')
-        except Exception as e:
-            print(f"⚠️ Error converting {image_path} to base64: {e}")
-            return None
+try:
+    import pybase64
+    PYBASE64_AVAILABLE = True
+except ImportError:
+    PYBASE64_AVAILABLE = False
 
-    def generate_html_email(self, analysis_data):
-        """Generate HTML email content with embedded charts"""
-        current_date = datetime.now().strftime("%Y-%m-%d %H:%M UTC")
-        
-        # Extract data from analysis_data
-        combined_data = analysis_data['combined']
-        consensus_signals = analysis_data['consensus']
-        momentum_signals = analysis_data['momentum']
-        mean_reversion_signals = analysis_data['mean_reversion']
-        contrarian_signals = analysis_data['contrarian']
-        stock_metadata = analysis_data['metadata']
-        
-        # Get top buy and sell signals from combined data
-        top_buy_signals = combined_data.nlargest(10, 'Combined_Buy_Signal') if not combined_data.empty else pd.DataFrame()
-        top_sell_signals = combined_data.nlargest(10, 'Combined_Sell_Signal') if not combined_data.empty else pd.DataFrame()
-        
-        # Convert charts to base64 for embedding
-        print("🖼️ Converting PNG charts to base64...")
-        combined_chart_b64 = self.image_to_base64(self.combined_chart) if os.path.exists(self.combined_chart) else None
-        # Fallback to old charts if combined chart not available
-        buy_chart_b64 = self.image_to_base64(self.buy_chart) if os.path.exists(self.buy_chart) else None
-        sell_chart_b64 = self.image_to_base64(self.sell_chart) if os.path.exists(self.sell_chart) else None
-        overview_chart_b64 = self.image_to_base64(self.overview_chart) if os.path.exists(self.overview_chart) else None
-        
-        # Start building HTML
-        html_content = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <style>
-        body {{ 
+# Lossless PNG optimizer, used on the charts before embedding when installed
+OXIPNG_PATH = shutil.which('oxipng')
+
+# Bytes read per base64 step; a multiple of 3 so chunks encode without padding
+B64_CHUNK_SIZE = 3 * 64 * 1024
+
+# Columns of the combined analysis CSV that the email actually renders, with explicit
+# types so the parser skips inference (float64 keeps the printed rounding unchanged)
+COMBINED_DTYPES = {
+    'Symbol': str,
+    'Current_Price': 'float64',
+    'Combined_Buy_Signal': 'float64',
+    'Combined_Sell_Signal': 'float64',
+    'Strategy_Type': str,
+    'Confidence_Score': 'float64',
+    'RSI': 'float64'
+}
+COMBINED_COLUMNS = list(COMBINED_DTYPES)
+
+# Outputs save_email_content produces by default; 'eml' (MIME message with cid: charts)
+# and 'gzip' (gzip-compressed copy of the HTML) are opt-in
+EMAIL_FORMATS = frozenset({'html', 'text', 'subject'})
+
+# Table text color per combined strategy type
+STRATEGY_COLOR = {
+    'CONSENSUS': '#6f42c1',
+    'MOMENTUM': '#fd7e14',
+    'MEAN_REVERSION': '#20c997',
+    'CONTRARIAN': '#ffc107',
+    'WEAK': '#6c757d'
+}
+
+# Static parts of the HTML email, kept out of the per-call f-strings. The
+# pieces written as-is are pre-encoded once since the HTML is built as bytes
+CSS_BLOCK = """        body { 
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; 
             line-height: 1.6; 
             color: #333; 
@@ -138,26 +81,26 @@ class GmailEmailSender:
             margin: 0 auto; 
             padding: 20px; 
             background-color: #f8f9fa;
-        }}
-        .container {{ background: white; border-radius: 12px; overflow: hidden; box-shadow: 0 4px 12px rgba(0,0,0,0.1); }}
-        .header {{ 
+        }
+        .container { background: white; border-radius: 12px; overflow: hidden; box-shadow: 0 4px 12px rgba(0,0,0,0.1); }
+        .header { 
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
             color: white; 
             padding: 30px 20px; 
             text-align: center; 
-        }}
-        .header h1 {{ margin: 0; font-size: 28px; font-weight: 600; }}
-        .header p {{ margin: 10px 0 0; opacity: 0.9; }}
-        .content {{ padding: 30px; }}
-        .summary {{ 
+        }
+        .header h1 { margin: 0; font-size: 28px; font-weight: 600; }
+        .header p { margin: 10px 0 0; opacity: 0.9; }
+        .content { padding: 30px; }
+        .summary { 
             background: linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%); 
             padding: 20px; 
             border-radius: 8px; 
             margin-bottom: 30px; 
-        }}
-        .summary h2 {{ margin-top: 0; color: #495057; }}
-        .metrics {{ display: flex; flex-wrap: wrap; gap: 15px; margin-top: 15px; }}
-        .metric {{ 
+        }
+        .summary h2 { margin-top: 0; color: #495057; }
+        .metrics { display: flex; flex-wrap: wrap; gap: 15px; margin-top: 15px; }
+        .metric { 
             background: white; 
             padding: 12px 16px; 
             border-radius: 6px; 
@@ -165,88 +108,99 @@ class GmailEmailSender:
             box-shadow: 0 2px 4px rgba(0,0,0,0.1);
             flex: 1;
             min-width: 200px;
-        }}
-        .metric-label {{ font-size: 12px; color: #6c757d; text-transform: uppercase; font-weight: 600; }}
-        .metric-value {{ font-size: 20px; font-weight: 700; color: #212529; }}
-        .chart-container {{ text-align: center; margin: 30px 0; }}
-        .chart-container h3 {{ color: #495057; margin-bottom: 15px; }}
-        .chart-container img {{ max-width: 100%; height: auto; border-radius: 8px; box-shadow: 0 4px 8px rgba(0,0,0,0.1); }}
-        .signals-section {{ margin-bottom: 40px; }}
-        .section-header {{ 
+        }
+        .metric-label { font-size: 12px; color: #6c757d; text-transform: uppercase; font-weight: 600; }
+        .metric-value { font-size: 20px; font-weight: 700; color: #212529; }
+        .chart-container { text-align: center; margin: 30px 0; }
+        .chart-container h3 { color: #495057; margin-bottom: 15px; }
+        .chart-container img { max-width: 100%; height: auto; border-radius: 8px; box-shadow: 0 4px 8px rgba(0,0,0,0.1); }
+        .signals-section { margin-bottom: 40px; }
+        .section-header { 
             display: flex; 
             align-items: center; 
             margin-bottom: 20px; 
             padding-bottom: 10px; 
             border-bottom: 2px solid #e9ecef; 
-        }}
-        .buy-signals .section-header {{ border-bottom-color: #28a745; }}
-        .sell-signals .section-header {{ border-bottom-color: #dc3545; }}
-        .section-header h2 {{ margin: 0; font-size: 22px; }}
-        .signal-table {{ 
+        }
+        .buy-signals .section-header { border-bottom-color: #28a745; }
+        .sell-signals .section-header { border-bottom-color: #dc3545; }
+        .section-header h2 { margin: 0; font-size: 22px; }
+        .signal-table { 
             width: 100%; 
             border-collapse: collapse; 
             background: white; 
             border-radius: 8px; 
             overflow: hidden; 
             box-shadow: 0 2px 8px rgba(0,0,0,0.1); 
-        }}
-        .signal-table th {{ 
+        }
+        .signal-table th { 
             background: #f8f9fa; 
             padding: 15px 12px; 
             text-align: left; 
             font-weight: 600; 
             color: #495057; 
             border-bottom: 2px solid #dee2e6; 
-        }}
-        .signal-table td {{ 
+        }
+        .signal-table td { 
             padding: 12px; 
             border-bottom: 1px solid #dee2e6; 
-        }}
-        .buy-row {{ background: rgba(40, 167, 69, 0.05); }}
-        .sell-row {{ background: rgba(220, 53, 69, 0.05); }}
-        .symbol {{ font-weight: 700; color: #212529; }}
-        .price {{ font-weight: 600; color: #007bff; }}
-        .signal-strength {{ font-weight: 600; }}
-        .rsi {{ font-family: monospace; }}
-        .change-positive {{ color: #28a745; font-weight: 600; }}
-        .change-negative {{ color: #dc3545; font-weight: 600; }}
-        .tips {{ 
+        }
+        .buy-row { background: rgba(40, 167, 69, 0.05); }
+        .sell-row { background: rgba(220, 53, 69, 0.05); }
+        .symbol { font-weight: 700; color: #212529; }
+        .price { font-weight: 600; color: #007bff; }
+        .signal-strength { font-weight: 600; }
+        .rsi { font-family: monospace; }
+        .change-positive { color: #28a745; font-weight: 600; }
+        .change-negative { color: #dc3545; font-weight: 600; }
+        .tips { 
             background: linear-gradient(135deg, #e3f2fd 0%, #bbdefb 100%); 
             padding: 25px; 
             border-radius: 8px; 
             margin-top: 30px; 
-        }}
-        .tips h3 {{ margin-top: 0; color: #1565c0; }}
-        .tips ul {{ margin: 0; }}
-        .tips li {{ margin-bottom: 8px; }}
-        .footer {{ 
+        }
+        .tips h3 { margin-top: 0; color: #1565c0; }
+        .tips ul { margin: 0; }
+        .tips li { margin-bottom: 8px; }
+        .footer { 
             text-align: center; 
             padding: 20px; 
             background: #f8f9fa; 
             color: #6c757d; 
             font-size: 13px; 
             border-top: 1px solid #dee2e6; 
-        }}
-        .embedded-note {{
+        }
+        .embedded-note {
             background: #d1ecf1;
             border: 1px solid #bee5eb;
             border-radius: 6px;
             padding: 15px;
             margin-top: 20px;
-        }}
-        .embedded-note h4 {{ margin-top: 0; color: #0c5460; }}
-        @media (max-width: 600px) {{
-            .metrics {{ flex-direction: column; }}
-            .signal-table {{ font-size: 14px; }}
-            .signal-table th, .signal-table td {{ padding: 8px; }}
-        }}
-    </style>
-</head>
+        }
+        .embedded-note h4 { margin-top: 0; color: #0c5460; }
+        @media (max-width: 600px) {
+            .metrics { flex-direction: column; }
+            .signal-table { font-size: 14px; }
+            .signal-table th, .signal-table td { padding: 8px; }
+        }
+"""
+
+HTML_HEAD = ("""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <style>
+""" + CSS_BLOCK + """    </style>
+</head>""").encode('utf-8')
+
+# Report header and summary metrics; only the date and counts vary between runs
+SUMMARY_TEMPLATE = Template("""
 <body>
     <div class="container">
         <div class="header">
             <h1>📈 Daily Trading Analysis Report</h1>
-            <p>{current_date}</p>
+            <p>$current_date</p>
         </div>
         
         <div class="content">
@@ -255,27 +209,27 @@ class GmailEmailSender:
                 <div class="metrics">
                     <div class="metric">
                         <div class="metric-label">Stocks Analyzed</div>
-                        <div class="metric-value">{len(combined_data)}</div>
+                        <div class="metric-value">$n_stocks</div>
                     </div>
                     <div class="metric">
                         <div class="metric-label">Strong Buy Signals</div>
-                        <div class="metric-value" style="color: #28a745;">{len(top_buy_signals)}</div>
+                        <div class="metric-value" style="color: #28a745;">$n_buy</div>
                     </div>
                     <div class="metric">
                         <div class="metric-label">Strong Sell Signals</div>
-                        <div class="metric-value" style="color: #dc3545;">{len(top_sell_signals)}</div>
+                        <div class="metric-value" style="color: #dc3545;">$n_sell</div>
                     </div>
                     <div class="metric">
                         <div class="metric-label">Consensus Signals</div>
-                        <div class="metric-value" style="color: #6f42c1;">{len(consensus_signals)}</div>
+                        <div class="metric-value" style="color: #6f42c1;">$n_consensus</div>
                     </div>
                     <div class="metric">
                         <div class="metric-label">Momentum Signals</div>
-                        <div class="metric-value" style="color: #fd7e14;">{len(momentum_signals)}</div>
+                        <div class="metric-value" style="color: #fd7e14;">$n_momentum</div>
                     </div>
                     <div class="metric">
                         <div class="metric-label">Mean Reversion</div>
-                        <div class="metric-value" style="color: #20c997;">{len(mean_reversion_signals)}</div>
+                        <div class="metric-value" style="color: #20c997;">$n_mean_reversion</div>
                     </div>
                 </div>
                 <p style="margin-top: 20px; color: #6c757d;">
@@ -283,25 +237,437 @@ class GmailEmailSender:
                     <strong>Sources:</strong> S&P 500, NASDAQ 100, Most Active, Recent IPOs &nbsp;•&nbsp;
                     <strong>Confidence Scoring:</strong> Multi-strategy validation
                 </p>
-            </div>"""
+            </div>""")
+
+TIPS_HTML = """
+            <div class="tips">
+                <h3>💡 Combined Strategy Trading Tips</h3>
+                <ul>
+                    <li><strong>Consensus Signals:</strong> Both mean reversion and momentum agree - highest confidence</li>
+                    <li><strong>Momentum Signals:</strong> Trend-following opportunities with strong directional bias</li>
+                    <li><strong>Mean Reversion:</strong> Contrarian plays expecting price normalization</li>
+                    <li><strong>Contrarian Signals:</strong> Strategies disagree - high risk but potential high reward</li>
+                    <li><strong>Risk Management:</strong> Always use stop-losses and proper position sizing</li>
+                    <li><strong>Confidence Scores:</strong> Higher scores indicate stronger signal validation</li>
+                </ul>
+            </div>
+            
+            <div class="embedded-note">
+                <h4>📊 Combined Strategy Dashboard</h4>
+                <p>This email contains the comprehensive combined strategy analysis dashboard:</p>
+                <ul>
+                    <li><strong>Buy/Sell Signal Charts:</strong> Top opportunities from both strategies</li>
+                    <li><strong>Strategy Distribution:</strong> Breakdown of signal types</li>
+                    <li><strong>Signal Strength Analysis:</strong> Confidence-weighted recommendations</li>
+                    <li><strong>Multi-Strategy Validation:</strong> Enhanced accuracy through strategy combination</li>
+                </ul>
+                <p><em>All charts embedded as base64 images - no external files needed!</em></p>
+            </div>
+""".encode('utf-8')
+
+FOOTER_HTML = """        </div>
+        
+        <div class="footer">
+            <p><strong>📧 Automated Trading Analysis</strong> | Embedded Charts Version</p>
+            <p>⚠️ <em>This analysis is for educational purposes only. Not financial advice.</em></p>
+            <p>📊 Data sources: Yahoo Finance via yfinance library</p>
+        </div>
+    </div>
+</body>
+</html>""".encode('utf-8')
+
+@dataclass
+class Report:
+    """Analysis results plus the derived views the HTML and text emails share"""
+    combined_len: int
+    consensus_count: int  # rows in each per-strategy signal CSV
+    momentum_count: int
+    mean_reversion_count: int
+    contrarian_count: int
+    metadata: list
+    top_buy: pd.DataFrame
+    top_sell: pd.DataFrame
+    strategy_counts: pd.Series
+    generated_at: datetime  # one timestamp shared by the subject, HTML and text
+
+class GmailEmailSender:
+    def __init__(self):
+        # Load environment variables
+        load_dotenv()
+        
+        # Email configuration
+        self.to_email = os.getenv('TO_EMAIL', 'haowang228@gmail.com')
+        
+        # File paths
+        self.output_dir = 'output'
+        # Updated to use combined strategy analysis files
+        self.combined_analysis_file = os.path.join(self.output_dir, 'combined_strategy_analysis.csv')
+        self.consensus_signals_file = os.path.join(self.output_dir, 'consensus_signals.csv')
+        self.momentum_signals_file = os.path.join(self.output_dir, 'momentum_dominant_signals.csv')
+        self.mean_reversion_signals_file = os.path.join(self.output_dir, 'mean_reversion_dominant_signals.csv')
+        self.contrarian_signals_file = os.path.join(self.output_dir, 'contrarian_signals.csv')
+        self.stocks_metadata_file = os.path.join(self.output_dir, 'top_stocks.json')
+        
+        # PNG chart files - updated to use combined strategy analysis
+        self.combined_chart = os.path.join(self.output_dir, 'combined_strategy_analysis.png')
+        # Keep fallback to old charts if available
+        self.buy_chart = os.path.join(self.output_dir, 'detailed_buy_signals.png')
+        self.sell_chart = os.path.join(self.output_dir, 'detailed_sell_signals.png')
+        self.overview_chart = os.path.join(self.output_dir, 'dynamic_multi_stock_signals.png')
+        
+        # Base64 copies of the charts, reused while the PNG is unchanged
+        self.b64_cache_dir = os.path.join(self.output_dir, '.cache')
+        
+        # Names present in output_dir, listed once on first use (see _exists)
+        self._present = None
+    
+    def _exists(self, path):
+        """Check whether an output_dir file exists using a single cached directory scan"""
+        if self._present is None:
+            try:
+                with os.scandir(self.output_dir) as entries:
+                    self._present = {entry.name for entry in entries}
+            except FileNotFoundError:
+                self._present = set()
+        return os.path.basename(path) in self._present
+    
+    def check_prerequisites(self):
+        """Check if all prerequisites are met"""
+        issues = []
+        
+        if not self._exists(self.combined_analysis_file):
+            issues.append(f"Combined analysis file not found: {self.combined_analysis_file}")
+        
+        if not self._exists(self.combined_chart):
+            issues.append(f"Combined strategy chart not found: {self.combined_chart}")
+        
+        return issues
+    
+    def _read_csv(self, path, usecols=None, dtype=None):
+        """Read a CSV with the multi-threaded PyArrow parser, falling back to the C engine"""
+        try:
+            return pd.read_csv(path, usecols=usecols, dtype=dtype, engine='pyarrow')
+        except ImportError:
+            return pd.read_csv(path, usecols=usecols, dtype=dtype)
+
+    def _fresh_parquet(self, csv_path):
+        """Path of a .parquet sibling at least as new as the CSV, or None"""
+        parquet_path = os.path.splitext(csv_path)[0] + '.parquet'
+        if not self._exists(parquet_path):
+            return None
+        try:
+            if os.stat(parquet_path).st_mtime_ns >= os.stat(csv_path).st_mtime_ns:
+                return parquet_path
+        except OSError:
+            pass
+        return None
+
+    def _safe_read_csv(self, path, usecols=None, dtype=None):
+        """Read a CSV if it exists (via an up-to-date Parquet sibling when possible), otherwise return an empty DataFrame"""
+        if not self._exists(path):
+            return pd.DataFrame()
+        
+        parquet_path = self._fresh_parquet(path)
+        if parquet_path:
+            try:
+                return pd.read_parquet(parquet_path, columns=usecols)
+            except (ImportError, ValueError, OSError):
+                pass  # No parquet engine, or the sibling lacks a column - reparse the CSV
+        
+        return self._read_csv(path, usecols=usecols, dtype=dtype)
+
+    def _count_rows(self, path):
+        """Number of data rows in a CSV (0 if missing), counted without parsing it into a DataFrame"""
+        if not self._exists(path):
+            return 0
+        with open(path, newline='', encoding='utf-8') as f:
+            # Blank lines are skipped like pandas does; the header is not a data row
+            return max(sum(1 for row in csv.reader(f) if row) - 1, 0)
+
+    def _load_metadata(self):
+        """Load the stock metadata JSON if it exists"""
+        if not self._exists(self.stocks_metadata_file):
+            return []
+        with open(self.stocks_metadata_file, 'r') as f:
+            return json.load(f)
+
+    def load_analysis_data(self, include_combined=True):
+        """Load the latest combined strategy analysis results (the combined frame only if include_combined)"""
+        try:
+            # The reads are independent and IO-bound, so overlap them
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                futures = {
+                    # Individual strategy files (if available) - the email only reports how many rows each has
+                    'consensus_count': executor.submit(self._count_rows, self.consensus_signals_file),
+                    'momentum_count': executor.submit(self._count_rows, self.momentum_signals_file),
+                    'mean_reversion_count': executor.submit(self._count_rows, self.mean_reversion_signals_file),
+                    'contrarian_count': executor.submit(self._count_rows, self.contrarian_signals_file),
+                    # Stock metadata
+                    'metadata': executor.submit(self._load_metadata)
+                }
+                if include_combined:
+                    # Combined analysis data (only the columns the email renders)
+                    futures['combined'] = executor.submit(self._safe_read_csv, self.combined_analysis_file, COMBINED_COLUMNS, COMBINED_DTYPES)
+                return {key: future.result() for key, future in futures.items()}
+            
+        except Exception as e:
+            print(f"❌ Error loading analysis data: {e}")
+            analysis_data = {
+                'consensus_count': 0,
+                'momentum_count': 0,
+                'mean_reversion_count': 0,
+                'contrarian_count': 0,
+                'metadata': []
+            }
+            if include_combined:
+                analysis_data['combined'] = pd.DataFrame()
+            return analysis_data
+
+    def image_to_base64(self, image_path):
+        """Convert image to base64 bytes for HTML embedding from a memory-mapped file (pybase64 SIMD if installed)"""
+        try:
+            with open(image_path, "rb") as img_file:
+                size = os.fstat(img_file.fileno()).st_size
+                if size == 0:
+                    return b''
+                with mmap.mmap(img_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                        # Single front-to-back pass: let the kernel read ahead and drop pages behind us
+                        mapped.madvise(mmap.MADV_SEQUENTIAL)
+                    with memoryview(mapped) as view:
+                        if PYBASE64_AVAILABLE:
+                            # SIMD codec: encode the whole mapping in one call
+                            return pybase64.b64encode(view)
+                        # Output size is known up front, so encode straight into one preallocated buffer
+                        encoded = bytearray((size + 2) // 3 * 4)
+                        pos = 0
+                        for start in range(0, size, B64_CHUNK_SIZE):
+                            chunk = binascii.b2a_base64(view[start:start + B64_CHUNK_SIZE], newline=False)
+                            encoded[pos:pos + len(chunk)] = chunk
+                            pos += len(chunk)
+                return encoded
+        except Exception as e:
+            print(f"⚠️ Error converting {image_path} to base64: {e}")
+            return None
+
+    def _atomic_write(self, path, data):
+        """Write bytes to a temp file and rename it into place"""
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _purge_b64_cache(self):
+        """Remove cached base64/optimizer entries whose source PNG is gone, plus temp files left by interrupted writes"""
+        try:
+            with os.scandir(self.b64_cache_dir) as entries:
+                for entry in entries:
+                    source = entry.name.split('.png')[0] + '.png'
+                    if entry.name.endswith('.tmp') or not self._exists(source):
+                        os.remove(entry.path)
+        except OSError:
+            pass
+
+    def _optimize_png(self, image_path, stat=None):
+        """Losslessly shrink a chart PNG in place with oxipng, once per version of the file; returns its current stat"""
+        try:
+            if stat is None:
+                stat = os.stat(image_path)
+        except OSError:
+            return None
+        if not OXIPNG_PATH:
+            return stat
+        
+        # Sidecar records the optimized file's mtime/size so an unchanged chart is not re-run
+        marker_path = os.path.join(self.b64_cache_dir, os.path.basename(image_path) + '.opt')
+        try:
+            with open(marker_path, 'r') as f:
+                if json.load(f) == {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}:
+                    return stat
+        except (OSError, ValueError):
+            pass
+        
+        try:
+            # --opt 2 gets most of the size reduction for a fraction of the CPU of --opt max
+            subprocess.run([OXIPNG_PATH, '--opt', '2', '--strip', 'safe', '--quiet', image_path],
+                           check=True, timeout=60)
+            stat = os.stat(image_path)
+            os.makedirs(self.b64_cache_dir, exist_ok=True)
+            self._atomic_write(marker_path, json.dumps({'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}).encode('utf-8'))
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"⚠️ Could not optimize {image_path}: {e}")
+        return stat
+
+    def _cached_b64(self, image_path):
+        """Base64 for an image, served from the disk cache while the PNG's mtime and size are unchanged"""
+        # A single stat doubles as the existence check (missing chart -> None)
+        try:
+            stat = os.stat(image_path)
+        except FileNotFoundError:
+            return None
+        except OSError:
+            return self.image_to_base64(image_path)
+        stat = self._optimize_png(image_path, stat)
+        
+        cache_path = os.path.join(self.b64_cache_dir, os.path.basename(image_path) + '.b64')
+        meta_path = cache_path + '.meta'
+        key = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+        try:
+            with open(meta_path, 'r') as f:
+                if json.load(f) == key:
+                    with open(cache_path, 'rb') as cached:
+                        return cached.read()
+        except (OSError, ValueError):
+            pass
+        
+        encoded = self.image_to_base64(image_path)
+        if encoded is not None:
+            try:
+                # Data first, then meta, so a half-written entry never looks valid
+                os.makedirs(self.b64_cache_dir, exist_ok=True)
+                self._atomic_write(cache_path, encoded)
+                self._atomic_write(meta_path, json.dumps(key).encode('utf-8'))
+            except OSError as e:
+                print(f"⚠️ Could not cache base64 for {image_path}: {e}")
+        return encoded
+
+    def _compute_tops(self, combined_data, n=10):
+        """Select the top n buy and sell signals once for both the HTML and text reports"""
+        if combined_data.empty:
+            return pd.DataFrame(), pd.DataFrame()
+        buy = combined_data['Combined_Buy_Signal'].to_numpy(dtype=float)
+        sell = combined_data['Combined_Sell_Signal'].to_numpy(dtype=float)
+        return (combined_data.iloc[top_n_positions(buy, n)],
+                combined_data.iloc[top_n_positions(sell, n)])
+
+    def _scan_combined(self, n=10):
+        """Stream the combined CSV (or its Parquet sibling) with polars, keeping only the top n signals and aggregates"""
+        parquet_path = self._fresh_parquet(self.combined_analysis_file)
+        if parquet_path:
+            scan = pl.scan_parquet(parquet_path)
+        else:
+            scan = pl.scan_csv(self.combined_analysis_file, schema_overrides={'Symbol': pl.String, 'Strategy_Type': pl.String})
+        scan = scan.select(COMBINED_COLUMNS).with_row_index('row')
+        # Sorting on (signal desc, row asc) + head lets polars keep a bounded heap, with nlargest's tie order
+        tops = [scan.sort([col, 'row'], descending=[True, False], nulls_last=True).head(n).drop('row')
+                for col in ('Combined_Buy_Signal', 'Combined_Sell_Signal')]
+        counts = (scan.drop_nulls('Strategy_Type').group_by('Strategy_Type', maintain_order=True).len()
+                  .sort('len', descending=True, maintain_order=True))
+        rows = scan.select(pl.len())
+        top_buy, top_sell, counts, rows = pl.collect_all(tops + [counts, rows])
+        strategy_counts = pd.Series(counts['len'].to_list(), index=counts['Strategy_Type'].to_list(), name='count')
+        return (pd.DataFrame(top_buy.to_dict(as_series=False)), pd.DataFrame(top_sell.to_dict(as_series=False)),
+                strategy_counts, rows.item())
+
+    def _build_report(self):
+        """Load the analysis data once and derive everything both email formats need"""
+        if POLARS_AVAILABLE and self._exists(self.combined_analysis_file):
+            # Never materialize the full combined frame, only the top rows and counts
+            analysis_data = self.load_analysis_data(include_combined=False)
+            top_buy, top_sell, strategy_counts, combined_len = self._scan_combined()
+        else:
+            analysis_data = self.load_analysis_data()
+            combined_data = analysis_data.pop('combined')
+            top_buy, top_sell = self._compute_tops(combined_data)
+            strategy_counts = combined_data['Strategy_Type'].value_counts() if not combined_data.empty else pd.Series(dtype=int)
+            combined_len = len(combined_data)
+        return Report(**analysis_data, combined_len=combined_len, top_buy=top_buy, top_sell=top_sell,
+                      strategy_counts=strategy_counts, generated_at=datetime.now())
+
+    def _render_signals(self, signals, signal_col, row_class):
+        """Format the top signals once into HTML table rows (top 8, UTF-8 bytes) and text lines (top 5)"""
+        if signals.empty:
+            return b'', []
+        signals = signals.head(8)
+        symbol = signals['Symbol'].astype(str)
+        price = signals['Current_Price'].map('{:.2f}'.format)
+        strength = signals[signal_col].map('{:.3f}'.format)
+        strategy = signals['Strategy_Type'].astype(str)
+        confidence = signals['Confidence_Score'].map('{:.2f}'.format)
+        rsi = signals['RSI'].map('{:.1f}'.format)
+        strategy_color = signals['Strategy_Type'].map(STRATEGY_COLOR).fillna('#6c757d')
+        
+        html_rows = (f'\n                        <tr class="{row_class}">'
+                     '\n                            <td class="symbol">' + symbol + '</td>'
+                     '\n                            <td class="price">$' + price + '</td>'
+                     '\n                            <td class="signal-strength">' + strength + '</td>'
+                     '\n                            <td style="color: ' + strategy_color + '; font-weight: 600;">' + strategy + '</td>'
+                     '\n                            <td class="signal-strength">' + confidence + '</td>'
+                     '\n                            <td class="rsi">' + rsi + '</td>'
+                     '\n                        </tr>')
+        text_rows = (symbol + ' - $' + price + ' | Signal: ' + strength + ' | Strategy: ' + strategy
+                     + ' | Confidence: ' + confidence + ' | RSI: ' + rsi + '\n').head(5)
+        text_lines = [f"{i}. {line}" for i, line in enumerate(text_rows, 1)]
+        return ''.join(html_rows).encode('utf-8'), text_lines
+
+    def _dashboard_chart(self):
+        """Path, content id, heading and alt text of the dashboard chart (combined, else market overview)"""
+        if self._exists(self.combined_chart):
+            return self.combined_chart, 'combined_chart', '📊 Combined Strategy Analysis Dashboard', 'Combined Strategy Analysis Chart'
+        if self._exists(self.overview_chart):
+            return self.overview_chart, 'overview_chart', '📊 Market Overview', 'Market Overview Chart'
+        return None
+
+    def write_html_email(self, fh, report, buy_rows, sell_rows, cid_charts=False):
+        """Stream the HTML email (UTF-8) to a binary file object with embedded (or cid:-referenced) charts and pre-rendered table rows"""
+        current_date = report.generated_at.strftime("%Y-%m-%d %H:%M UTC")
+        
+        # Extract data from the report
+        combined_len = report.combined_len
+        top_buy_signals = report.top_buy
+        top_sell_signals = report.top_sell
+        
+        if cid_charts:
+            # Charts travel as MIME parts referenced by content id, so skip base64 entirely
+            combined_chart_b64 = overview_chart_b64 = None
+        else:
+            # Convert charts to base64 for embedding (only the one that is actually shown)
+            print("🖼️ Converting PNG charts to base64...")
+            self._purge_b64_cache()
+            combined_chart_b64 = self._cached_b64(self.combined_chart)
+            # Fallback to old overview chart if combined chart not available
+            overview_chart_b64 = None if combined_chart_b64 else self._cached_b64(self.overview_chart)
+        
+        # Write the HTML as UTF-8 chunks so the base64 charts are spliced in as-is, never joined in memory
+        fh.write(HTML_HEAD)
+        fh.write(SUMMARY_TEMPLATE.substitute(
+            current_date=current_date,
+            n_stocks=combined_len,
+            n_buy=len(top_buy_signals),
+            n_sell=len(top_sell_signals),
+            n_consensus=report.consensus_count,
+            n_momentum=report.momentum_count,
+            n_mean_reversion=report.mean_reversion_count
+        ).encode('utf-8'))
 
         # Combined Strategy Chart
-        if combined_chart_b64:
-            html_content += f"""
+        if cid_charts:
+            chart = self._dashboard_chart()
+            if chart:
+                _, cid, heading, alt = chart
+                fh.write(f"""
+            <div class="chart-container">
+                <h3>{heading}</h3>
+                <img src="cid:{cid}" alt="{alt}" />
+            </div>""".encode('utf-8'))
+        elif combined_chart_b64:
+            fh.write("""
             <div class="chart-container">
                 <h3>📊 Combined Strategy Analysis Dashboard</h3>
-                <img src="data:image/png;base64,{combined_chart_b64}" alt="Combined Strategy Analysis Chart" />
-            </div>"""
+                <img src="data:image/png;base64,""".encode('utf-8'))
+            fh.write(combined_chart_b64)
+            fh.write(b'" alt="Combined Strategy Analysis Chart" />\n            </div>')
         elif overview_chart_b64:
-            html_content += f"""
+            fh.write("""
             <div class="chart-container">
                 <h3>📊 Market Overview</h3>
-                <img src="data:image/png;base64,{overview_chart_b64}" alt="Market Overview Chart" />
-            </div>"""
+                <img src="data:image/png;base64,""".encode('utf-8'))
+            fh.write(overview_chart_b64)
+            fh.write(b'" alt="Market Overview Chart" />\n            </div>')
 
         # Buy Signals Section
         if not top_buy_signals.empty:
-            html_content += """
+            fh.write("""
             <div class="signals-section buy-signals">
                 <div class="section-header">
                     <h2>🟢 Top Combined Buy Signals</h2>
@@ -317,36 +683,18 @@ class GmailEmailSender:
                             <th>RSI</th>
                         </tr>
                     </thead>
-                    <tbody>"""
+                    <tbody>""".encode('utf-8'))
             
-            for _, row in top_buy_signals.head(8).iterrows():
-                # Determine strategy type color
-                strategy_color = {
-                    'CONSENSUS': '#6f42c1',
-                    'MOMENTUM': '#fd7e14', 
-                    'MEAN_REVERSION': '#20c997',
-                    'CONTRARIAN': '#ffc107',
-                    'WEAK': '#6c757d'
-                }.get(row['Strategy_Type'], '#6c757d')
-                
-                html_content += f"""
-                        <tr class="buy-row">
-                            <td class="symbol">{row['Symbol']}</td>
-                            <td class="price">${row['Current_Price']:.2f}</td>
-                            <td class="signal-strength">{row['Combined_Buy_Signal']:.3f}</td>
-                            <td style="color: {strategy_color}; font-weight: 600;">{row['Strategy_Type']}</td>
-                            <td class="signal-strength">{row['Confidence_Score']:.2f}</td>
-                            <td class="rsi">{row['RSI']:.1f}</td>
-                        </tr>"""
+            fh.write(buy_rows)
             
-            html_content += """
+            fh.write("""
                     </tbody>
                 </table>
-            </div>"""
+            </div>""".encode('utf-8'))
 
         # Sell Signals Section
         if not top_sell_signals.empty:
-            html_content += """
+            fh.write("""
             <div class="signals-section sell-signals">
                 <div class="section-header">
                     <h2>🔴 Top Combined Sell Signals</h2>
@@ -362,141 +710,67 @@ class GmailEmailSender:
                             <th>RSI</th>
                         </tr>
                     </thead>
-                    <tbody>"""
+                    <tbody>""".encode('utf-8'))
             
-            for _, row in top_sell_signals.head(8).iterrows():
-                # Determine strategy type color
-                strategy_color = {
-                    'CONSENSUS': '#6f42c1',
-                    'MOMENTUM': '#fd7e14', 
-                    'MEAN_REVERSION': '#20c997',
-                    'CONTRARIAN': '#ffc107',
-                    'WEAK': '#6c757d'
-                }.get(row['Strategy_Type'], '#6c757d')
-                
-                html_content += f"""
-                        <tr class="sell-row">
-                            <td class="symbol">{row['Symbol']}</td>
-                            <td class="price">${row['Current_Price']:.2f}</td>
-                            <td class="signal-strength">{row['Combined_Sell_Signal']:.3f}</td>
-                            <td style="color: {strategy_color}; font-weight: 600;">{row['Strategy_Type']}</td>
-                            <td class="signal-strength">{row['Confidence_Score']:.2f}</td>
-                            <td class="rsi">{row['RSI']:.1f}</td>
-                        </tr>"""
+            fh.write(sell_rows)
             
-            html_content += """
+            fh.write("""
                     </tbody>
                 </table>
-            </div>"""
+            </div>""".encode('utf-8'))
 
         # Tips and Footer
-        html_content += """
-            <div class="tips">
-                <h3>💡 Combined Strategy Trading Tips</h3>
-                <ul>
-                    <li><strong>Consensus Signals:</strong> Both mean reversion and momentum agree - highest confidence</li>
-                    <li><strong>Momentum Signals:</strong> Trend-following opportunities with strong directional bias</li>
-                    <li><strong>Mean Reversion:</strong> Contrarian plays expecting price normalization</li>
-                    <li><strong>Contrarian Signals:</strong> Strategies disagree - high risk but potential high reward</li>
-                    <li><strong>Risk Management:</strong> Always use stop-losses and proper position sizing</li>
-                    <li><strong>Confidence Scores:</strong> Higher scores indicate stronger signal validation</li>
-                </ul>
-            </div>
-            
-            <div class="embedded-note">
-                <h4>📊 Combined Strategy Dashboard</h4>
-                <p>This email contains the comprehensive combined strategy analysis dashboard:</p>
-                <ul>
-                    <li><strong>Buy/Sell Signal Charts:</strong> Top opportunities from both strategies</li>
-                    <li><strong>Strategy Distribution:</strong> Breakdown of signal types</li>
-                    <li><strong>Signal Strength Analysis:</strong> Confidence-weighted recommendations</li>
-                    <li><strong>Multi-Strategy Validation:</strong> Enhanced accuracy through strategy combination</li>
-                </ul>
-                <p><em>All charts embedded as base64 images - no external files needed!</em></p>
-            </div>
-        </div>
-        
-        <div class="footer">
-            <p><strong>📧 Automated Trading Analysis</strong> | Embedded Charts Version</p>
-            <p>⚠️ <em>This analysis is for educational purposes only. Not financial advice.</em></p>
-            <p>📊 Data sources: Yahoo Finance via yfinance library</p>
-        </div>
-    </div>
-</body>
-</html>"""
-        
-        return html_content
+        fh.write(TIPS_HTML)
+        fh.write(FOOTER_HTML)
 
-    def save_email_content(self):
-        """Generate and save email content with embedded charts"""
+    def generate_html_email(self, report, buy_rows, sell_rows, cid_charts=False):
+        """Generate HTML email content as UTF-8 bytes (see write_html_email)"""
+        buffer = io.BytesIO()
+        self.write_html_email(buffer, report, buy_rows, sell_rows, cid_charts)
+        return buffer.getvalue()
+
+    def generate_text_email(self, report, buy_lines, sell_lines):
+        """Generate the plain-text summary from pre-rendered signal lines"""
+        combined_len = report.combined_len
+        strategy_counts = report.strategy_counts
         
-        try:
-            # Load analysis data
-            print("📊 Loading combined strategy analysis data...")
-            analysis_data = self.load_analysis_data()
-            
-            if analysis_data['combined'].empty:
-                print("❌ No combined analysis data found")
-                return False
-            
-            # Generate HTML content with embedded charts
-            print("📝 Generating HTML email with embedded charts...")
-            html_content = self.generate_html_email(analysis_data)
-            
-            # Save HTML content
-            html_file = os.path.join(self.output_dir, 'gmail_embedded_email.html')
-            with open(html_file, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            print(f"✅ HTML email with embedded charts saved to {html_file}")
-            
-            # Extract data for text summary
-            combined_data = analysis_data['combined']
-            top_buy_signals = combined_data.nlargest(5, 'Combined_Buy_Signal')
-            top_sell_signals = combined_data.nlargest(5, 'Combined_Sell_Signal')
-            strategy_counts = combined_data['Strategy_Type'].value_counts()
-            
-            # Generate plain text summary
-            current_date = datetime.now().strftime("%Y-%m-%d %H:%M UTC")
-            text_content = f"""📈 COMBINED STRATEGY ANALYSIS REPORT - {current_date}
+        current_date = report.generated_at.strftime("%Y-%m-%d %H:%M UTC")
+        text_parts = [f"""📈 COMBINED STRATEGY ANALYSIS REPORT - {current_date}
 {'='*60}
 
 📊 COMBINED STRATEGY SUMMARY:
-• Total Stocks Analyzed: {len(combined_data)}
-• Strong Buy Signals: {len(top_buy_signals)}
-• Strong Sell Signals: {len(top_sell_signals)}
-• Consensus Signals: {len(analysis_data['consensus'])}
-• Momentum Signals: {len(analysis_data['momentum'])}
-• Mean Reversion Signals: {len(analysis_data['mean_reversion'])}
+• Total Stocks Analyzed: {combined_len}
+• Strong Buy Signals: {len(buy_lines)}
+• Strong Sell Signals: {len(sell_lines)}
+• Consensus Signals: {report.consensus_count}
+• Momentum Signals: {report.momentum_count}
+• Mean Reversion Signals: {report.mean_reversion_count}
 • Data Sources: S&P 500, NASDAQ 100, Most Active, Recent IPOs
 • Strategies: Mean Reversion + Momentum Analysis
 
 🎯 STRATEGY BREAKDOWN:
 {'-'*50}
-"""
-            
-            for strategy, count in strategy_counts.items():
-                percentage = (count / len(combined_data)) * 100
-                text_content += f"• {strategy.replace('_', ' ')}: {count} stocks ({percentage:.1f}%)\n"
-            
-            text_content += f"""
+"""]
+        
+        strategy_percentages = (strategy_counts / combined_len * 100).tolist()
+        for (strategy, count), percentage in zip(strategy_counts.items(), strategy_percentages):
+            text_parts.append(f"• {strategy.replace('_', ' ')}: {count} stocks ({percentage:.1f}%)\n")
+        
+        text_parts.append(f"""
 🟢 TOP 5 COMBINED BUY SIGNALS:
 {'-'*50}
-"""
-            
-            if not top_buy_signals.empty:
-                for i, (_, row) in enumerate(top_buy_signals.iterrows(), 1):
-                    text_content += f"{i}. {row['Symbol']} - ${row['Current_Price']:.2f} | Signal: {row['Combined_Buy_Signal']:.3f} | Strategy: {row['Strategy_Type']} | Confidence: {row['Confidence_Score']:.2f} | RSI: {row['RSI']:.1f}\n"
-            
-            text_content += f"""
+""")
+        
+        text_parts.extend(buy_lines)
+        
+        text_parts.append(f"""
 🔴 TOP 5 COMBINED SELL SIGNALS:
 {'-'*50}
-"""
-            
-            if not top_sell_signals.empty:
-                for i, (_, row) in enumerate(top_sell_signals.iterrows(), 1):
-                    text_content += f"{i}. {row['Symbol']} - ${row['Current_Price']:.2f} | Signal: {row['Combined_Sell_Signal']:.3f} | Strategy: {row['Strategy_Type']} | Confidence: {row['Confidence_Score']:.2f} | RSI: {row['RSI']:.1f}\n"
-            
-            text_content += f"""
+""")
+        
+        text_parts.extend(sell_lines)
+        
+        text_parts.append(f"""
 💡 COMBINED STRATEGY TIPS:
 • Consensus Signals: Both strategies agree - highest confidence
 • Momentum Signals: Trend-following opportunities with directional bias
@@ -514,31 +788,116 @@ class GmailEmailSender:
 📧 Combined Strategy Analysis | Embedded Charts Version
 ⚠️  This is for educational purposes only. Not financial advice.
 📊 Data sources: Yahoo Finance via yfinance library
-"""
+""")
+        
+        return ''.join(text_parts)
+
+    def generate_mime_email(self, report, buy_rows, sell_rows, text_content, subject):
+        """Build a multipart/related email with the dashboard chart attached as a cid: image instead of inlined"""
+        html_content = self.generate_html_email(report, buy_rows, sell_rows, cid_charts=True)
+        
+        msg = EmailMessage()
+        msg['Subject'] = subject
+        msg['To'] = self.to_email
+        msg.set_content(text_content)
+        msg.add_alternative(html_content.decode('utf-8'), subtype='html')
+        
+        # The PNG goes in as raw bytes; the MIME serializer base64-encodes it once
+        chart = self._dashboard_chart()
+        if chart:
+            self._optimize_png(chart[0])
+            with open(chart[0], 'rb') as f:
+                msg.get_payload()[1].add_related(f.read(), maintype='image', subtype='png', cid=f'<{chart[1]}>')
+        return msg
+
+    def _render_email(self, report, formats=EMAIL_FORMATS, html_out=None):
+        """Render the requested outputs as {format: content} from one formatting pass over the top signals
+        (the HTML is streamed to html_out instead when given)"""
+        buy_rows, buy_lines = self._render_signals(report.top_buy, 'Combined_Buy_Signal', 'buy-row')
+        sell_rows, sell_lines = self._render_signals(report.top_sell, 'Combined_Sell_Signal', 'sell-row')
+        outputs = {'subject': f"📈 Combined Strategy Analysis - {report.generated_at.strftime('%Y-%m-%d')} (Multi-Strategy Dashboard)"}
+        if html_out is not None:
+            self.write_html_email(html_out, report, buy_rows, sell_rows)
+        elif 'html' in formats or 'gzip' in formats:
+            outputs['html'] = self.generate_html_email(report, buy_rows, sell_rows)
+        if 'text' in formats or 'eml' in formats:
+            outputs['text'] = self.generate_text_email(report, buy_lines, sell_lines)
+        if 'eml' in formats:
+            outputs['eml'] = self.generate_mime_email(report, buy_rows, sell_rows, outputs['text'], outputs['subject'])
+        return outputs
+
+    def save_email_content(self, formats=EMAIL_FORMATS):
+        """Generate and save email content with embedded charts (only the files named in formats)"""
+        
+        try:
+            # Load analysis data and select top signals once for both formats
+            print("📊 Loading combined strategy analysis data...")
+            report = self._build_report()
+            
+            if report.combined_len == 0:
+                print("❌ No combined analysis data found")
+                return False
+            
+            # Generate HTML content with embedded charts, plus the text summary and subject
+            if 'html' in formats or 'gzip' in formats:
+                print("📝 Generating HTML email with embedded charts...")
+            html_file = os.path.join(self.output_dir, 'gmail_embedded_email.html')
+            gz_file = html_file + '.gz'
+            # Stream the HTML straight to its file (or to the .gz when that is the only HTML output)
+            if 'html' in formats:
+                html_out = open(html_file, 'wb')
+            elif 'gzip' in formats:
+                html_out = gzip.open(gz_file, 'wb', compresslevel=6)
+            else:
+                html_out = None
+            try:
+                outputs = self._render_email(report, formats, html_out)
+            finally:
+                if html_out is not None:
+                    html_out.close()
+            subject = outputs['subject']
+            
+            if 'html' in formats:
+                print(f"✅ HTML email with embedded charts saved to {html_file}")
+            
+            # Save gzip-compressed HTML (base64 and the repeated markup compress well)
+            if 'gzip' in formats:
+                if 'html' in formats:
+                    with open(html_file, 'rb') as src, gzip.open(gz_file, 'wb', compresslevel=6) as dst:
+                        shutil.copyfileobj(src, dst)
+                print(f"✅ Compressed HTML email saved to {gz_file}")
             
             # Save text content
-            text_file = os.path.join(self.output_dir, 'gmail_embedded_email.txt')
-            with open(text_file, 'w', encoding='utf-8') as f:
-                f.write(text_content)
-            print(f"✅ Text email content saved to {text_file}")
+            if 'text' in formats:
+                text_file = os.path.join(self.output_dir, 'gmail_embedded_email.txt')
+                with open(text_file, 'wb') as f:
+                    f.write(outputs['text'].encode('utf-8'))
+                print(f"✅ Text email content saved to {text_file}")
+            
+            # Save email subject
+            if 'subject' in formats:
+                subject_file = os.path.join(self.output_dir, 'gmail_embedded_subject.txt')
+                with open(subject_file, 'wb') as f:
+                    f.write(subject.encode('utf-8'))
+                print(f"✅ Email subject saved to {subject_file}")
             
-            # Create email subject
-            subject = f"📈 Combined Strategy Analysis - {datetime.now().strftime('%Y-%m-%d')} (Multi-Strategy Dashboard)"
-            subject_file = os.path.join(self.output_dir, 'gmail_embedded_subject.txt')
-            with open(subject_file, 'w', encoding='utf-8') as f:
-                f.write(subject)
-            print(f"✅ Email subject saved to {subject_file}")
+            # Save MIME message with the chart as a related cid: attachment
+            if 'eml' in formats:
+                eml_file = os.path.join(self.output_dir, 'gmail_related_email.eml')
+                with open(eml_file, 'wb') as f:
+                    f.write(outputs['eml'].as_bytes())
+                print(f"✅ MIME email with cid: chart saved to {eml_file}")
             
             # Show file summary
             print(f"\n📋 Email Content Summary:")
             print(f"   📧 Subject: {subject}")
             print(f"   📄 Recipients: {self.to_email}")
-            print(f"   📊 Combined signals: {len(combined_data)} stocks analyzed")
-            print(f"   🎯 Strategy breakdown: {len(analysis_data['consensus'])} consensus, {len(analysis_data['momentum'])} momentum, {len(analysis_data['mean_reversion'])} mean reversion")
+            print(f"   📊 Combined signals: {report.combined_len} stocks analyzed")
+            print(f"   🎯 Strategy breakdown: {report.consensus_count} consensus, {report.momentum_count} momentum, {report.mean_reversion_count} mean reversion")
             print(f"   🖼️ Embedded charts: Combined strategy dashboard with buy/sell signals")
             
             # Show file sizes
-            if os.path.exists(html_file):
+            if 'html' in formats and os.path.exists(html_file):
                 size_mb = os.path.getsize(html_file) / (1024 * 1024)
                 print(f"\n📊 Generated File:")
                 print(f"   📁 {os.path.basename(html_file)}: {size_mb:.1f} MB (includes embedded charts)")
@@ -574,8 +933,15 @@ def main():
         
         return
     
-    # All prerequisites met, generate email content
-    success = sender.save_email_content()
+    # All prerequisites met, generate email content (--html-only skips the plain-text version,
+    # --eml also writes a MIME message with the chart attached instead of base64-inlined,
+    # --gzip also writes a gzip-compressed copy of the HTML)
+    formats = EMAIL_FORMATS - {'text'} if '--html-only' in sys.argv else EMAIL_FORMATS
+    if '--eml' in sys.argv:
+        formats = formats | {'eml'}
+    if '--gzip' in sys.argv:
+        formats = formats | {'gzip'}
+    success = sender.save_email_content(formats)
     
     if success:
         print("\n💡 Next Steps:")
@@ -0,0 +1,177 @@
+"""
+Technical indicator kernels shared by the strategy modules.
+
+Each kernel is a plain loop over NumPy arrays that is JIT-compiled when Numba
+is installed (see numba_compat) and runs as ordinary Python otherwise. Compiled
+kernels release the GIL, so several threads can run them at once.
+"""
+
+import numpy as np
+from numba_compat import njit
+
+@njit(cache=True, nogil=True)
+def wilder_rsi(close, period=14):
+    """Relative Strength Index with Wilder's smoothing, computed in one pass over close"""
+    n = close.shape[0]
+    out = np.full(n, np.nan)
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, n):
+        delta = close[i] - close[i - 1]
+        if delta != delta:
+            # Missing price: count the day as unchanged rather than poisoning the average
+            delta = 0.0
+        gain = delta if delta > 0.0 else 0.0
+        loss = -delta if delta < 0.0 else 0.0
+
+        if i <= period:
+            # Seed with the simple average of the first `period` changes
+            avg_gain += gain / period
+            avg_loss += loss / period
+            if i < period:
+                continue
+        else:
+            avg_gain = (avg_gain * (period - 1) + gain) / period
+            avg_loss = (avg_loss * (period - 1) + loss) / period
+
+        if avg_loss > 0.0:
+            out[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        elif avg_gain > 0.0:
+            out[i] = 100.0
+    return out
+
+# Row order of the momentum_indicators output
+MOMENTUM_COLUMNS = (
+    'RSI', 'MACD', 'MACD_Signal', 'MACD_Histogram',
+    'ROC_5', 'ROC_10', 'ROC_20',
+    'SMA_10', 'SMA_20', 'SMA_50', 'SMA_200',
+    'Volume_SMA', 'Volume_Momentum',
+    'Price_vs_SMA10', 'Price_vs_SMA20', 'Price_vs_SMA50', 'Price_vs_SMA200'
+)
+
+@njit(inline='always')
+def _div(a, b):
+    """a / b with NumPy semantics (inf or NaN instead of ZeroDivisionError)"""
+    if b == 0.0:
+        if a == 0.0 or a != a:
+            return np.nan
+        return np.inf if a > 0.0 else -np.inf
+    return a / b
+
+@njit(cache=True, nogil=True)
+def ema(x, span):
+    """Exponentially weighted mean, matching pandas ewm(span=span).mean() (adjust=True)"""
+    n = x.shape[0]
+    out = np.empty(n)
+    decay = 1.0 - 2.0 / (span + 1.0)
+    num = 0.0
+    den = 0.0
+    for i in range(n):
+        # Weighted sum and weight total both decay each step, so missing values keep their gap
+        num *= decay
+        den *= decay
+        if x[i] == x[i]:
+            num += x[i]
+            den += 1.0
+        out[i] = num / den if den > 0.0 else np.nan
+    return out
+
+@njit(cache=True, nogil=True)
+def macd_lines(close, fast=12, slow=26, signal=9, start=0):
+    """MACD, signal and histogram lines as a (3, n - start) array, with all three EMAs
+    (pandas adjust=True semantics, as in ema) advanced together in one pass over close"""
+    n = close.shape[0]
+    out = np.empty((3, n - start))
+    decay_fast = 1.0 - 2.0 / (fast + 1.0)
+    decay_slow = 1.0 - 2.0 / (slow + 1.0)
+    decay_signal = 1.0 - 2.0 / (signal + 1.0)
+    num_fast = den_fast = num_slow = den_slow = num_signal = den_signal = 0.0
+    for i in range(n):
+        num_fast *= decay_fast
+        den_fast *= decay_fast
+        num_slow *= decay_slow
+        den_slow *= decay_slow
+        if close[i] == close[i]:
+            num_fast += close[i]
+            den_fast += 1.0
+            num_slow += close[i]
+            den_slow += 1.0
+        macd = (num_fast / den_fast if den_fast > 0.0 else np.nan) - (num_slow / den_slow if den_slow > 0.0 else np.nan)
+
+        # The signal line is the EMA of the MACD line itself
+        num_signal *= decay_signal
+        den_signal *= decay_signal
+        if macd == macd:
+            num_signal += macd
+            den_signal += 1.0
+        macd_signal = num_signal / den_signal if den_signal > 0.0 else np.nan
+
+        if i >= start:
+            out[0, i - start] = macd
+            out[1, i - start] = macd_signal
+            out[2, i - start] = macd - macd_signal
+    return out
+
+@njit(cache=True, nogil=True)
+def rolling_means(x, windows, start=0):
+    """Trailing means of x for several windows in one pass, as a (len(windows), n - start) array
+    (NaN until a window is full and gap-free)"""
+    n = x.shape[0]
+    k = windows.shape[0]
+    out = np.full((k, n - start), np.nan)
+    totals = np.zeros(k)
+    missing = np.zeros(k, np.int64)
+    for i in range(n):
+        value = x[i]
+        for j in range(k):
+            # Running sum: add the new value, drop the one leaving the window
+            window = windows[j]
+            if value == value:
+                totals[j] += value
+            else:
+                missing[j] += 1
+            if i >= window:
+                old = x[i - window]
+                if old == old:
+                    totals[j] -= old
+                else:
+                    missing[j] -= 1
+            if i >= start and i >= window - 1 and missing[j] == 0:
+                out[j, i - start] = totals[j] / window
+    return out
+
+@njit(cache=True, nogil=True)
+def pct_change(x, periods):
+    """Percent change over `periods` steps, in percent"""
+    n = x.shape[0]
+    out = np.full(n, np.nan)
+    for i in range(periods, n):
+        out[i] = (_div(x[i], x[i - periods]) - 1.0) * 100.0
+    return out
+
+@njit(cache=True, nogil=True)
+def momentum_indicators(close, volume, tail=0):
+    """Momentum indicators as a (len(MOMENTUM_COLUMNS), m) array, one row per column, for the
+    last `tail` bars (every bar when tail is 0)"""
+    n = close.shape[0]
+    m = n if tail <= 0 or tail > n else tail
+    start = n - m
+    out = np.empty((len(MOMENTUM_COLUMNS), m))
+    out[0] = wilder_rsi(close, 14)[start:]
+
+    # MACD (12/26 EMA difference) with its 9-period signal line and histogram
+    out[1:4] = macd_lines(close, 12, 26, 9, start)
+
+    out[4] = pct_change(close, 5)[start:]
+    out[5] = pct_change(close, 10)[start:]
+    out[6] = pct_change(close, 20)[start:]
+
+    out[7:11] = rolling_means(close, np.array((10, 20, 50, 200)), start)
+    out[11] = rolling_means(volume, np.array((20,)), start)[0]
+
+    for j in range(m):
+        i = start + j
+        out[12, j] = _div(volume[i], out[11, j])
+        for k in range(4):
+            out[13 + k, j] = (_div(close[i], out[7 + k, j]) - 1.0) * 100.0
+    return out
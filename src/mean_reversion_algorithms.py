@@ -1,17 +1,45 @@
 import yfinance as yf
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 from datetime import datetime, timedelta
 import warnings
-import time
-import json
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dynamic_stock_fetcher import DynamicStockFetcher
+from price_history import PRICE_COLUMNS, download_price_history, yahoo_session
+from signal_ranking import nlargest_rows
+from indicator_kernels import wilder_rsi
 warnings.filterwarnings('ignore')
 
+# Concurrent per-symbol downloads; the work is network-bound so threads overlap well
+FETCH_WORKERS = 16
+
+# Attempts for a single-symbol download that comes back empty (Yahoo throttling), with
+# exponential backoff starting at FETCH_BACKOFF seconds
+FETCH_RETRIES = 3
+FETCH_BACKOFF = 0.5
+
+# RSI smoothing period
+RSI_PERIOD = 14
+
+# Bars kept per stock in the price panels: the longest indicator window (SMA_200)
+PANEL_BARS = 200
+
+# Bars of closing prices kept per stock for the price charts
+PLOT_BARS = 60
+
+# Resolution of the saved signals chart; 150 dpi keeps the 24x16in figure legible at a quarter of the pixels of 300
+CHART_DPI = 150
+
+# Latest-bar indicator values per stock, in calculate_latest_indicators column order
+LATEST_COLUMNS = ('Close', 'Lower_Band', 'Upper_Band', 'BB_Position', 'RSI', 'Z_Score', 'Volume_Ratio',
+                  'Price_Change_5d', 'Price_Change_20d', 'Price_vs_SMA50', 'Price_vs_SMA200')
+LATEST_INDEX = {name: j for j, name in enumerate(LATEST_COLUMNS)}
+
+
 class MeanReversionAlgorithms:
-    def __init__(self, lookback_days=252, num_stocks=100):
+    def __init__(self, lookback_days=252, num_stocks=100, price_cache=None):
         self.lookback_days = lookback_days
         self.num_stocks = num_stocks
         self.end_date = datetime.now()
@@ -20,245 +48,106 @@ class MeanReversionAlgorithms:
         self.signals_df = None
         self.stock_fetcher = DynamicStockFetcher()
         self.popular_stocks = []
+        # Optional prefetched {symbol: Close/Volume DataFrame}; symbols found here skip their own download
+        self.price_cache = price_cache
+        # One pooled HTTP session for every Yahoo request instead of a new one per download
+        self.session = yahoo_session()
         self.output_dir = 'output'
         
         # Create output directory if it doesn't exist
         os.makedirs(self.output_dir, exist_ok=True)
         
-    def load_stocks_from_file(self, filename='top_stocks.json'):
-        """Load stocks from existing JSON file"""
-        try:
-            filepath = os.path.join(self.output_dir, filename)
-            if os.path.exists(filepath):
-                print(f"Loading existing stock list from {filepath}...")
-                with open(filepath, 'r') as f:
-                    stocks_data = json.load(f)
-                
-                # Extract symbols from the loaded data
-                symbols = [stock['symbol'] for stock in stocks_data[:self.num_stocks]]
-                
-                print(f"Loaded {len(symbols)} stocks from existing file")
-                print(f"Top 10 stocks: {symbols[:10]}")
-                return symbols
-            else:
-                print(f"No existing {filepath} found")
-                return None
-                
-        except Exception as e:
-            print(f"Error loading from {filepath}: {e}")
-            return None
-    
     def fetch_dynamic_stock_list(self, force_refresh=False):
         """Fetch the most popular stocks dynamically or from cache"""
-        
-        # First try to load from existing file unless force refresh
-        if not force_refresh:
-            cached_stocks = self.load_stocks_from_file()
-            if cached_stocks:
-                self.popular_stocks = cached_stocks
-                return self.popular_stocks
-        
-        print("Fetching fresh dynamic list of most popular stocks...")
-        print("=" * 60)
-        
-        # Get top stocks from dynamic fetcher
-        top_stocks_data = self.stock_fetcher.fetch_top_stocks(self.num_stocks)
-        
-        # Extract just the symbols
-        self.popular_stocks = self.stock_fetcher.get_stock_symbols_only(top_stocks_data)
-        
-        print(f"\nDynamic stock list ready: {len(self.popular_stocks)} stocks")
+        self.popular_stocks = self.stock_fetcher.fetch_dynamic_stock_list(self.num_stocks, force_refresh)
         return self.popular_stocks
     
     def fetch_stock_data(self, symbol):
         """Fetch data for a single stock"""
+        if self.price_cache is not None and symbol in self.price_cache:
+            # Indicators are computed from the price panel, so the cached frame is never modified and needs no copy
+            data = self.price_cache[symbol].loc[self.start_date.strftime('%Y-%m-%d'):]
+            return data if len(data) > 50 else None
+        
         try:
-            data = yf.download(symbol, start=self.start_date.strftime('%Y-%m-%d'), 
-                             end=self.end_date.strftime('%Y-%m-%d'), progress=False)
+            for attempt in range(FETCH_RETRIES):
+                # threads=False: this already runs on a fetch worker thread
+                data = yf.download(symbol, start=self.start_date.strftime('%Y-%m-%d'), 
+                                 end=self.end_date.strftime('%Y-%m-%d'), progress=False,
+                                 threads=False, session=self.session)
+                if len(data) > 0 or attempt == FETCH_RETRIES - 1:
+                    break
+                time.sleep(FETCH_BACKOFF * 2 ** attempt)
             if isinstance(data.columns, pd.MultiIndex):
                 data.columns = data.columns.droplevel(1)
             
             if len(data) > 50:  # Ensure we have enough data
-                return data
+                # Only Close and Volume are used; drop Open/High/Low before anything else touches the frame
+                return data[PRICE_COLUMNS]
             return None
         except Exception as e:
             print(f"Error fetching {symbol}: {e}")
             return None
     
-    def calculate_indicators(self, data):
-        """Calculate technical indicators for a stock"""
-        if data is None or len(data) < 50:
-            return None
-        
-        # Bollinger Bands
-        data['SMA_20'] = data['Close'].rolling(window=20).mean()
-        data['STD_20'] = data['Close'].rolling(window=20).std()
-        data['Upper_Band'] = data['SMA_20'] + (data['STD_20'] * 2)
-        data['Lower_Band'] = data['SMA_20'] - (data['STD_20'] * 2)
-        data['BB_Position'] = (data['Close'] - data['Lower_Band']) / (data['Upper_Band'] - data['Lower_Band'])
-        
-        # RSI
-        delta = data['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        data['RSI'] = 100 - (100 / (1 + rs))
-        
-        # Z-Score
-        data['Price_Mean'] = data['Close'].rolling(window=20).mean()
-        data['Price_Std'] = data['Close'].rolling(window=20).std()
-        data['Z_Score'] = (data['Close'] - data['Price_Mean']) / data['Price_Std']
-        
-        # Volume indicators
-        data['Volume_SMA'] = data['Volume'].rolling(window=20).mean()
-        data['Volume_Ratio'] = data['Volume'] / data['Volume_SMA']
-        
-        # Price momentum
-        data['Price_Change_5d'] = data['Close'].pct_change(5)
-        data['Price_Change_20d'] = data['Close'].pct_change(20)
-        
-        # Additional indicators for enhanced scoring
-        data['SMA_50'] = data['Close'].rolling(window=50).mean()
-        data['SMA_200'] = data['Close'].rolling(window=200).mean()
-        data['Price_vs_SMA50'] = (data['Close'] / data['SMA_50'] - 1) * 100
-        data['Price_vs_SMA200'] = (data['Close'] / data['SMA_200'] - 1) * 100
-        
-        return data
+    def calculate_latest_indicators(self, close, volume, rsi):
+        """Latest-bar indicators for many stocks at once from tail-aligned (N, PANEL_BARS) close/volume
+        panels and each stock's latest RSI, as an (N, len(LATEST_COLUMNS)) array"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            last = close[:, -1]
+            
+            # Bollinger Bands and Z-Score share the 20-day mean and sample std
+            window_20 = close[:, -20:]
+            sma_20 = window_20.mean(axis=1)
+            std_20 = window_20.std(axis=1, ddof=1)
+            upper_band = sma_20 + std_20 * 2
+            lower_band = sma_20 - std_20 * 2
+            bb_position = (last - lower_band) / (upper_band - lower_band)
+            z_score = (last - sma_20) / std_20
+            
+            volume_ratio = volume[:, -1] / volume[:, -20:].mean(axis=1)
+            change_5d = last / close[:, -6] - 1
+            change_20d = last / close[:, -21] - 1
+            vs_sma50 = (last / close[:, -50:].mean(axis=1) - 1) * 100
+            vs_sma200 = (last / close[:, -200:].mean(axis=1) - 1) * 100
+        
+        return np.column_stack((last, lower_band, upper_band, bb_position, rsi, z_score, volume_ratio,
+                                change_5d, change_20d, vs_sma50, vs_sma200))
     
-    def calculate_signal_strength(self, data):
-        """Calculate signal strength for mean reversion with enhanced scoring"""
-        if data is None or len(data) < 50:
-            return None, None
-        
-        latest = data.iloc[-1]
-        
-        # Buy signal components (oversold conditions)
-        buy_signals = []
-        
-        # Bollinger Bands: Price below lower band
-        if latest['Close'] <= latest['Lower_Band']:
-            buy_signals.append(1.0)
-        elif latest['BB_Position'] < 0.2:
-            buy_signals.append(0.6)
-        elif latest['BB_Position'] < 0.3:
-            buy_signals.append(0.3)
-        else:
-            buy_signals.append(0.0)
-        
-        # RSI: Oversold
-        if latest['RSI'] <= 20:
-            buy_signals.append(1.0)
-        elif latest['RSI'] <= 30:
-            buy_signals.append(0.8)
-        elif latest['RSI'] <= 40:
-            buy_signals.append(0.4)
-        else:
-            buy_signals.append(0.0)
-        
-        # Z-Score: Significantly undervalued
-        if latest['Z_Score'] <= -2.5:
-            buy_signals.append(1.0)
-        elif latest['Z_Score'] <= -2.0:
-            buy_signals.append(0.8)
-        elif latest['Z_Score'] <= -1.5:
-            buy_signals.append(0.6)
-        elif latest['Z_Score'] <= -1.0:
-            buy_signals.append(0.3)
-        else:
-            buy_signals.append(0.0)
-        
-        # Volume confirmation
-        if latest['Volume_Ratio'] > 2.0:
-            buy_signals.append(0.6)
-        elif latest['Volume_Ratio'] > 1.5:
-            buy_signals.append(0.4)
-        elif latest['Volume_Ratio'] > 1.2:
-            buy_signals.append(0.2)
-        else:
-            buy_signals.append(0.0)
-        
-        # Recent decline (momentum)
-        if latest['Price_Change_5d'] < -0.10:  # 10% decline
-            buy_signals.append(0.8)
-        elif latest['Price_Change_5d'] < -0.05:  # 5% decline
-            buy_signals.append(0.5)
-        elif latest['Price_Change_5d'] < -0.02:
-            buy_signals.append(0.3)
-        else:
-            buy_signals.append(0.0)
-        
-        # Long-term trend support
-        if latest['Price_vs_SMA200'] > -10 and latest['Price_vs_SMA50'] < -5:
-            buy_signals.append(0.3)  # Near long-term support but short-term oversold
-        else:
-            buy_signals.append(0.0)
-        
-        # Sell signal components (overbought conditions)
-        sell_signals = []
-        
-        # Bollinger Bands: Price above upper band
-        if latest['Close'] >= latest['Upper_Band']:
-            sell_signals.append(1.0)
-        elif latest['BB_Position'] > 0.8:
-            sell_signals.append(0.6)
-        elif latest['BB_Position'] > 0.7:
-            sell_signals.append(0.3)
-        else:
-            sell_signals.append(0.0)
-        
-        # RSI: Overbought
-        if latest['RSI'] >= 80:
-            sell_signals.append(1.0)
-        elif latest['RSI'] >= 70:
-            sell_signals.append(0.8)
-        elif latest['RSI'] >= 60:
-            sell_signals.append(0.4)
-        else:
-            sell_signals.append(0.0)
-        
-        # Z-Score: Significantly overvalued
-        if latest['Z_Score'] >= 2.5:
-            sell_signals.append(1.0)
-        elif latest['Z_Score'] >= 2.0:
-            sell_signals.append(0.8)
-        elif latest['Z_Score'] >= 1.5:
-            sell_signals.append(0.6)
-        elif latest['Z_Score'] >= 1.0:
-            sell_signals.append(0.3)
-        else:
-            sell_signals.append(0.0)
-        
-        # Volume confirmation
-        if latest['Volume_Ratio'] > 2.0:
-            sell_signals.append(0.6)
-        elif latest['Volume_Ratio'] > 1.5:
-            sell_signals.append(0.4)
-        elif latest['Volume_Ratio'] > 1.2:
-            sell_signals.append(0.2)
-        else:
-            sell_signals.append(0.0)
-        
-        # Recent gain (momentum)
-        if latest['Price_Change_5d'] > 0.10:  # 10% gain
-            sell_signals.append(0.8)
-        elif latest['Price_Change_5d'] > 0.05:  # 5% gain
-            sell_signals.append(0.5)
-        elif latest['Price_Change_5d'] > 0.02:
-            sell_signals.append(0.3)
-        else:
-            sell_signals.append(0.0)
-        
-        # Long-term trend resistance
-        if latest['Price_vs_SMA200'] < 10 and latest['Price_vs_SMA50'] > 5:
-            sell_signals.append(0.3)  # Near long-term resistance but short-term overbought
-        else:
-            sell_signals.append(0.0)
-        
-        # Calculate weighted signal strength
-        buy_strength = np.mean(buy_signals)
-        sell_strength = np.mean(sell_signals)
-        
-        return buy_strength, sell_strength
+    def score_signals(self, latest):
+        """Buy and sell strengths for many stocks at once from an (N, len(LATEST_COLUMNS)) array"""
+        col = LATEST_INDEX
+        close, bb_position = latest[:, col['Close']], latest[:, col['BB_Position']]
+        rsi, z_score = latest[:, col['RSI']], latest[:, col['Z_Score']]
+        volume_ratio, change_5d = latest[:, col['Volume_Ratio']], latest[:, col['Price_Change_5d']]
+        vs_sma50, vs_sma200 = latest[:, col['Price_vs_SMA50']], latest[:, col['Price_vs_SMA200']]
+        
+        # np.select keeps the first matching rule, like if/elif; NaN fails every test and scores 0
+        # Volume confirmation counts for both sides
+        volume_score = np.select([volume_ratio > 2.0, volume_ratio > 1.5, volume_ratio > 1.2], [0.6, 0.4, 0.2], 0.0)
+        
+        # Buy signal components (oversold conditions): Bollinger Bands, RSI, Z-Score, recent decline
+        # and long-term trend support (near long-term support but short-term oversold)
+        buy_components = (
+            np.select([close <= latest[:, col['Lower_Band']], bb_position < 0.2, bb_position < 0.3], [1.0, 0.6, 0.3], 0.0),
+            np.select([rsi <= 20, rsi <= 30, rsi <= 40], [1.0, 0.8, 0.4], 0.0),
+            np.select([z_score <= -2.5, z_score <= -2.0, z_score <= -1.5, z_score <= -1.0], [1.0, 0.8, 0.6, 0.3], 0.0),
+            volume_score,
+            np.select([change_5d < -0.10, change_5d < -0.05, change_5d < -0.02], [0.8, 0.5, 0.3], 0.0),
+            np.where((vs_sma200 > -10) & (vs_sma50 < -5), 0.3, 0.0),
+        )
+        
+        # Sell signal components (overbought conditions), mirroring the buy side
+        sell_components = (
+            np.select([close >= latest[:, col['Upper_Band']], bb_position > 0.8, bb_position > 0.7], [1.0, 0.6, 0.3], 0.0),
+            np.select([rsi >= 80, rsi >= 70, rsi >= 60], [1.0, 0.8, 0.4], 0.0),
+            np.select([z_score >= 2.5, z_score >= 2.0, z_score >= 1.5, z_score >= 1.0], [1.0, 0.8, 0.6, 0.3], 0.0),
+            volume_score,
+            np.select([change_5d > 0.10, change_5d > 0.05, change_5d > 0.02], [0.8, 0.5, 0.3], 0.0),
+            np.where((vs_sma200 < 10) & (vs_sma50 > 5), 0.3, 0.0),
+        )
+        
+        # Equal-weighted mean of the six components, summed in the original order
+        return sum(buy_components) / len(buy_components), sum(sell_components) / len(sell_components)
     
     def analyze_all_stocks(self):
         """Analyze all stocks and generate signals"""
@@ -267,55 +156,54 @@ class MeanReversionAlgorithms:
         
         # Suppress intermediate output - will be shown in combined analysis only
         
-        results = []
-        processed = 0
-        
-        for symbol in self.popular_stocks:
-            # Silent processing for cleaner output
+        if self.price_cache is None:
+            # One bulk request for the whole universe instead of one per symbol
+            self.price_cache = download_price_history(self.popular_stocks, self.start_date, self.end_date,
+                                                      cache_dir=os.path.join(self.output_dir, 'prices'))
+        
+        # Symbols the bulk request missed download concurrently; map keeps stock-list order
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+            fetched = list(executor.map(self.fetch_stock_data, self.popular_stocks))
+        
+        # Stack every stock's last PANEL_BARS bars into tail-aligned (N, PANEL_BARS) panels (NaN where
+        # a stock has less history) so indicators are computed for the whole universe at once
+        loaded = [(symbol, data) for symbol, data in zip(self.popular_stocks, fetched)
+                  if data is not None and len(data) >= 50]
+        close = np.full((len(loaded), PANEL_BARS), np.nan)
+        volume = np.full_like(close, np.nan)
+        rsi = np.empty(len(loaded))
+        for row, (symbol, data) in enumerate(loaded):
+            # Wilder's RSI depends on the whole history, so it runs over the full series (one compiled pass)
+            rsi[row] = wilder_rsi(data['Close'].to_numpy(dtype=np.float64), RSI_PERIOD)[-1]
+            tail = data.iloc[-PANEL_BARS:]
+            close[row, PANEL_BARS - len(tail):] = tail['Close'].to_numpy(dtype=np.float64)
+            volume[row, PANEL_BARS - len(tail):] = tail['Volume'].to_numpy(dtype=np.float64)
             
-            # Fetch data
-            data = self.fetch_stock_data(symbol)
-            if data is None:
-                continue
-            
-            # Calculate indicators
-            data = self.calculate_indicators(data)
-            if data is None:
-                continue
-            
-            # Calculate signal strength
-            buy_strength, sell_strength = self.calculate_signal_strength(data)
-            if buy_strength is None:
-                continue
-            
-            # Store data for later plotting
-            self.stock_data[symbol] = data
-            
-            # Get latest metrics
-            latest = data.iloc[-1]
-            
-            results.append({
-                'Symbol': symbol,
-                'Current_Price': latest['Close'],
-                'Buy_Signal_Strength': buy_strength,
-                'Sell_Signal_Strength': sell_strength,
-                'RSI': latest['RSI'],
-                'Z_Score': latest['Z_Score'],
-                'BB_Position': latest['BB_Position'],
-                'Volume_Ratio': latest['Volume_Ratio'],
-                'Price_Change_5d': latest['Price_Change_5d'] * 100,
-                'Price_Change_20d': latest['Price_Change_20d'] * 100,
-                'Price_vs_SMA50': latest['Price_vs_SMA50'],
-                'Price_vs_SMA200': latest['Price_vs_SMA200']
-            })
-            
-            processed += 1
-            time.sleep(0.02)  # Small delay to avoid rate limiting
+            # Keep only the closes the price charts plot
+            self.stock_data[symbol] = data.iloc[-PLOT_BARS:][['Close']]
+        
+        latest = self.calculate_latest_indicators(close, volume, rsi)
+        
+        # Score the whole universe in one vectorized pass
+        buy_strength, sell_strength = self.score_signals(latest)
+        
+        col = LATEST_INDEX
+        self.signals_df = pd.DataFrame({
+            'Symbol': [symbol for symbol, _ in loaded],
+            'Current_Price': latest[:, col['Close']],
+            'Buy_Signal_Strength': buy_strength,
+            'Sell_Signal_Strength': sell_strength,
+            'RSI': latest[:, col['RSI']],
+            'Z_Score': latest[:, col['Z_Score']],
+            'BB_Position': latest[:, col['BB_Position']],
+            'Volume_Ratio': latest[:, col['Volume_Ratio']],
+            'Price_Change_5d': latest[:, col['Price_Change_5d']] * 100,
+            'Price_Change_20d': latest[:, col['Price_Change_20d']] * 100,
+            'Price_vs_SMA50': latest[:, col['Price_vs_SMA50']],
+            'Price_vs_SMA200': latest[:, col['Price_vs_SMA200']]
+        })
         
         # Analysis complete - results ready for processing
-        
-        # Create DataFrame with results
-        self.signals_df = pd.DataFrame(results)
         return self.signals_df
     
     def get_top_signals(self, top_n=15):
@@ -323,21 +211,28 @@ class MeanReversionAlgorithms:
         if self.signals_df is None:
             return None, None
         
-        # Sort by signal strength
-        top_buys = self.signals_df.nlargest(top_n, 'Buy_Signal_Strength')
-        top_sells = self.signals_df.nlargest(top_n, 'Sell_Signal_Strength')
+        # Partition-based selection, same rows and order as nlargest
+        top_buys = nlargest_rows(self.signals_df, top_n, 'Buy_Signal_Strength')
+        top_sells = nlargest_rows(self.signals_df, top_n, 'Sell_Signal_Strength')
         
         return top_buys, top_sells
     
     def plot_signals(self, top_buys, top_sells):
         """Plot the top buy and sell signals"""
-        fig, axes = plt.subplots(2, 3, figsize=(24, 16))
+        # Imported lazily so the analysis path never pays for pyplot/backend initialization;
+        # Agg renders straight to the PNG without a display
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        
+        # constrained_layout places the colorbars while drawing instead of a tight_layout() re-solve
+        fig, axes = plt.subplots(2, 3, figsize=(24, 16), constrained_layout=True)
         
         # Plot 1: Top Buy Signals - Price Charts
         ax1 = axes[0, 0]
         for symbol in top_buys['Symbol'].head(10):
             if symbol in self.stock_data:
-                data = self.stock_data[symbol].tail(60)  # Last 60 days
+                data = self.stock_data[symbol]  # Last 60 days
                 normalized_price = (data['Close'] / data['Close'].iloc[0] - 1) * 100
                 ax1.plot(data.index, normalized_price, label=symbol, alpha=0.7, linewidth=2)
         
@@ -350,7 +245,7 @@ class MeanReversionAlgorithms:
         ax2 = axes[0, 1]
         for symbol in top_sells['Symbol'].head(10):
             if symbol in self.stock_data:
-                data = self.stock_data[symbol].tail(60)
+                data = self.stock_data[symbol]
                 normalized_price = (data['Close'] / data['Close'].iloc[0] - 1) * 100
                 ax2.plot(data.index, normalized_price, label=symbol, alpha=0.7, linewidth=2)
         
@@ -419,10 +314,9 @@ class MeanReversionAlgorithms:
         ax6.grid(True, alpha=0.3)
         plt.colorbar(scatter, ax=ax6, label='Sell Signal Strength')
         
-        plt.tight_layout()
         output_path = os.path.join(self.output_dir, 'dynamic_multi_stock_signals.png')
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.show()
+        plt.savefig(output_path, dpi=CHART_DPI, bbox_inches='tight')
+        plt.close(fig)
     
     def run_analysis(self, force_refresh_stocks=False, silent=False):
         """Run the complete dynamic multi-stock analysis"""
@@ -430,8 +324,9 @@ class MeanReversionAlgorithms:
             print("Dynamic Multi-Stock Mean Reversion Analysis")
             print("=" * 60)
         
-        # Fetch dynamic stock list first (will use cache if available)
-        self.fetch_dynamic_stock_list(force_refresh=force_refresh_stocks)
+        # Fetch dynamic stock list first (will use cache if available) unless one was already provided
+        if force_refresh_stocks or not self.popular_stocks:
+            self.fetch_dynamic_stock_list(force_refresh=force_refresh_stocks)
         
         # Analyze all stocks
         signals_df = self.analyze_all_stocks()
@@ -1,17 +1,32 @@
 import yfinance as yf
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 from datetime import datetime, timedelta
 import warnings
-import time
-import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dynamic_stock_fetcher import DynamicStockFetcher
+from price_history import PRICE_COLUMNS, download_price_history, yahoo_session
+from signal_ranking import nlargest_rows
+from indicator_kernels import MOMENTUM_COLUMNS, momentum_indicators
 warnings.filterwarnings('ignore')
 
+# Indicator values kept per stock (latest and previous bar), in array column order
+SNAPSHOT_COLUMNS = ('Close',) + MOMENTUM_COLUMNS
+SNAPSHOT_INDEX = {name: j for j, name in enumerate(SNAPSHOT_COLUMNS)}
+
+# Indicators reported alongside the signal strengths
+RESULT_COLUMNS = ('RSI', 'MACD', 'MACD_Signal', 'MACD_Histogram', 'ROC_5', 'ROC_20',
+                  'Price_vs_SMA10', 'Price_vs_SMA20', 'Price_vs_SMA50', 'Volume_Momentum')
+
+# Concurrent per-symbol downloads; the work is network-bound so threads overlap well
+FETCH_WORKERS = 16
+
+# Bars of closing prices kept per stock in stock_data
+PLOT_BARS = 60
+
 class MomentumAlgorithms:
-    def __init__(self, lookback_days=252, num_stocks=100):
+    def __init__(self, lookback_days=252, num_stocks=100, price_cache=None):
         self.lookback_days = lookback_days
         self.num_stocks = num_stocks
         self.end_date = datetime.now()
@@ -20,193 +35,96 @@ class MomentumAlgorithms:
         self.signals_df = None
         self.stock_fetcher = DynamicStockFetcher()
         self.popular_stocks = []
+        # Optional prefetched {symbol: Close/Volume DataFrame}; symbols found here skip their own download
+        self.price_cache = price_cache
+        # One pooled HTTP session for every Yahoo request instead of a new one per download
+        self.session = yahoo_session()
         self.output_dir = 'output'
         
         os.makedirs(self.output_dir, exist_ok=True)
         
-    def load_stocks_from_file(self, filename='top_stocks.json'):
-        """Load stocks from existing JSON file"""
-        try:
-            filepath = os.path.join(self.output_dir, filename)
-            if os.path.exists(filepath):
-                print(f"Loading existing stock list from {filepath}...")
-                with open(filepath, 'r') as f:
-                    stocks_data = json.load(f)
-                
-                symbols = [stock['symbol'] for stock in stocks_data[:self.num_stocks]]
-                
-                print(f"Loaded {len(symbols)} stocks from existing file")
-                print(f"Top 10 stocks: {symbols[:10]}")
-                return symbols
-            else:
-                print(f"No existing {filepath} found")
-                return None
-                
-        except Exception as e:
-            print(f"Error loading from {filepath}: {e}")
-            return None
-    
     def fetch_dynamic_stock_list(self, force_refresh=False):
         """Fetch the most popular stocks dynamically or from cache"""
-        
-        if not force_refresh:
-            cached_stocks = self.load_stocks_from_file()
-            if cached_stocks:
-                self.popular_stocks = cached_stocks
-                return self.popular_stocks
-        
-        print("Fetching fresh dynamic list of most popular stocks...")
-        print("=" * 60)
-        
-        top_stocks_data = self.stock_fetcher.fetch_top_stocks(self.num_stocks)
-        self.popular_stocks = self.stock_fetcher.get_stock_symbols_only(top_stocks_data)
-        
-        print(f"\nDynamic stock list ready: {len(self.popular_stocks)} stocks")
+        self.popular_stocks = self.stock_fetcher.fetch_dynamic_stock_list(self.num_stocks, force_refresh)
         return self.popular_stocks
     
     def fetch_stock_data(self, symbol):
         """Fetch data for a single stock"""
+        if self.price_cache is not None and symbol in self.price_cache:
+            # Indicators are computed on arrays, so the cached frame is never modified and needs no copy
+            data = self.price_cache[symbol].loc[self.start_date.strftime('%Y-%m-%d'):]
+            return data if len(data) > 50 else None
+        
         try:
             data = yf.download(symbol, start=self.start_date.strftime('%Y-%m-%d'), 
-                             end=self.end_date.strftime('%Y-%m-%d'), progress=False)
+                             end=self.end_date.strftime('%Y-%m-%d'), progress=False,
+                             session=self.session)
             if isinstance(data.columns, pd.MultiIndex):
                 data.columns = data.columns.droplevel(1)
             
             if len(data) > 50:
-                return data
+                # Only Close and Volume are used; drop Open/High/Low before anything else touches the frame
+                return data[PRICE_COLUMNS]
             return None
         except Exception as e:
             print(f"Error fetching {symbol}: {e}")
             return None
 
-    def calculate_rsi(self, prices, period=14):
-        """Calculate Relative Strength Index"""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+    def _compute_snapshot(self, close, volume):
+        """(len(SNAPSHOT_COLUMNS), 2) array of previous/latest values computed straight from the price arrays"""
+        # RSI, MACD, rate of change, moving averages and volume momentum in one kernel call;
+        # signals only look at the last two bars, so only those are written out
+        return np.vstack((close[-2:], momentum_indicators(close, volume, 2)))
     
-    def calculate_macd(self, prices, fast=12, slow=26, signal=9):
-        """Calculate MACD (Moving Average Convergence Divergence)"""
-        exp1 = prices.ewm(span=fast).mean()
-        exp2 = prices.ewm(span=slow).mean()
-        macd = exp1 - exp2
-        macd_signal = macd.ewm(span=signal).mean()
-        macd_histogram = macd - macd_signal
-        return macd, macd_signal, macd_histogram
-    
-    def calculate_momentum_indicators(self, data):
-        """Calculate all momentum indicators for a stock"""
+    def _load_indicators(self, symbol):
+        """Fetch one stock's history and compute its indicator snapshot array (runs on a worker thread)"""
+        data = self.fetch_stock_data(symbol)
         if data is None or len(data) < 50:
-            return None
-        
-        # RSI
-        data['RSI'] = self.calculate_rsi(data['Close'])
-        
-        # MACD
-        data['MACD'], data['MACD_Signal'], data['MACD_Histogram'] = self.calculate_macd(data['Close'])
-        
-        # Price momentum (rate of change)
-        data['ROC_5'] = data['Close'].pct_change(5) * 100
-        data['ROC_10'] = data['Close'].pct_change(10) * 100
-        data['ROC_20'] = data['Close'].pct_change(20) * 100
-        
-        # Moving averages
-        data['SMA_10'] = data['Close'].rolling(window=10).mean()
-        data['SMA_20'] = data['Close'].rolling(window=20).mean()
-        data['SMA_50'] = data['Close'].rolling(window=50).mean()
-        data['SMA_200'] = data['Close'].rolling(window=200).mean()
-        
-        # Volume momentum
-        data['Volume_SMA'] = data['Volume'].rolling(window=20).mean()
-        data['Volume_Momentum'] = data['Volume'] / data['Volume_SMA']
-        
-        # Price position relative to moving averages
-        data['Price_vs_SMA10'] = (data['Close'] / data['SMA_10'] - 1) * 100
-        data['Price_vs_SMA20'] = (data['Close'] / data['SMA_20'] - 1) * 100
-        data['Price_vs_SMA50'] = (data['Close'] / data['SMA_50'] - 1) * 100
-        data['Price_vs_SMA200'] = (data['Close'] / data['SMA_200'] - 1) * 100
-        
-        return data
+            return data, None
+        return data, self._compute_snapshot(data['Close'].to_numpy(dtype=np.float64),
+                                            data['Volume'].to_numpy(dtype=np.float64))
     
-    def calculate_momentum_signal_strength(self, data):
-        """Calculate combined momentum signal strength"""
-        if data is None or len(data) < 50:
-            return None, None
-        
-        latest = data.iloc[-1]
-        prev = data.iloc[-2]
-        
-        buy_strength = 0.0
-        sell_strength = 0.0
-        
-        # RSI momentum signals
-        if latest['RSI'] > 60 and prev['RSI'] <= 60:
-            buy_strength += 0.3
-        elif latest['RSI'] > 50 and prev['RSI'] <= 50:
-            buy_strength += 0.2
-        elif latest['RSI'] > 55:
-            buy_strength += 0.1
-        
-        if latest['RSI'] < 40 and prev['RSI'] >= 40:
-            sell_strength += 0.3
-        elif latest['RSI'] < 50 and prev['RSI'] >= 50:
-            sell_strength += 0.2
-        elif latest['RSI'] < 45:
-            sell_strength += 0.1
+    def score_momentum_signals(self, latest, prev):
+        """Buy and sell strengths for many stocks at once from (N, K) latest/previous indicator arrays"""
+        col = SNAPSHOT_INDEX
+        rsi, rsi_prev = latest[:, col['RSI']], prev[:, col['RSI']]
+        macd, macd_prev = latest[:, col['MACD']], prev[:, col['MACD']]
+        macd_signal, macd_signal_prev = latest[:, col['MACD_Signal']], prev[:, col['MACD_Signal']]
+        macd_histogram = latest[:, col['MACD_Histogram']]
+        roc_5 = latest[:, col['ROC_5']]
+        
+        # RSI momentum signals (np.select keeps the first matching rule, like if/elif)
+        buy_strength = np.select([(rsi > 60) & (rsi_prev <= 60), (rsi > 50) & (rsi_prev <= 50), rsi > 55],
+                                 [0.3, 0.2, 0.1], 0.0)
+        sell_strength = np.select([(rsi < 40) & (rsi_prev >= 40), (rsi < 50) & (rsi_prev >= 50), rsi < 45],
+                                  [0.3, 0.2, 0.1], 0.0)
         
         # MACD momentum signals
-        if latest['MACD'] > latest['MACD_Signal'] and prev['MACD'] <= prev['MACD_Signal']:
-            buy_strength += 0.4
-        elif latest['MACD'] > latest['MACD_Signal'] and latest['MACD_Histogram'] > 0:
-            buy_strength += 0.2
-        
-        if latest['MACD'] < latest['MACD_Signal'] and prev['MACD'] >= prev['MACD_Signal']:
-            sell_strength += 0.4
-        elif latest['MACD'] < latest['MACD_Signal'] and latest['MACD_Histogram'] < 0:
-            sell_strength += 0.2
+        buy_strength = buy_strength + np.select(
+            [(macd > macd_signal) & (macd_prev <= macd_signal_prev), (macd > macd_signal) & (macd_histogram > 0)],
+            [0.4, 0.2], 0.0)
+        sell_strength = sell_strength + np.select(
+            [(macd < macd_signal) & (macd_prev >= macd_signal_prev), (macd < macd_signal) & (macd_histogram < 0)],
+            [0.4, 0.2], 0.0)
         
         # Price momentum
-        if latest['ROC_5'] > 5:
-            buy_strength += 0.2
-        elif latest['ROC_5'] > 2:
-            buy_strength += 0.1
-        elif latest['ROC_5'] < -5:
-            sell_strength += 0.2
-        elif latest['ROC_5'] < -2:
-            sell_strength += 0.1
+        buy_strength = buy_strength + np.select([roc_5 > 5, roc_5 > 2], [0.2, 0.1], 0.0)
+        sell_strength = sell_strength + np.select([roc_5 < -5, roc_5 < -2], [0.2, 0.1], 0.0)
         
         # Moving average alignment
-        ma_signals = 0
-        if latest['Price_vs_SMA10'] > 0:
-            ma_signals += 1
-        if latest['Price_vs_SMA20'] > 0:
-            ma_signals += 1
-        if latest['Price_vs_SMA50'] > 0:
-            ma_signals += 1
-        if latest['Price_vs_SMA200'] > 0:
-            ma_signals += 1
-        
-        if ma_signals >= 3:
-            buy_strength += 0.3
-        elif ma_signals >= 2:
-            buy_strength += 0.1
-        
-        if ma_signals <= 1:
-            sell_strength += 0.3
-        elif ma_signals <= 2:
-            sell_strength += 0.1
+        ma_signals = ((latest[:, col['Price_vs_SMA10']] > 0).astype(int)
+                      + (latest[:, col['Price_vs_SMA20']] > 0)
+                      + (latest[:, col['Price_vs_SMA50']] > 0)
+                      + (latest[:, col['Price_vs_SMA200']] > 0))
+        buy_strength = buy_strength + np.select([ma_signals >= 3, ma_signals >= 2], [0.3, 0.1], 0.0)
+        sell_strength = sell_strength + np.select([ma_signals <= 1, ma_signals <= 2], [0.3, 0.1], 0.0)
         
         # Volume confirmation
-        if latest['Volume_Momentum'] > 1.5:
-            if latest['ROC_5'] > 0:
-                buy_strength += 0.1
-            else:
-                sell_strength += 0.1
+        high_volume = latest[:, col['Volume_Momentum']] > 1.5
+        buy_strength = buy_strength + np.where(high_volume & (roc_5 > 0), 0.1, 0.0)
+        sell_strength = sell_strength + np.where(high_volume & ~(roc_5 > 0), 0.1, 0.0)
         
-        return min(buy_strength, 1.0), min(sell_strength, 1.0)
+        return np.minimum(buy_strength, 1.0), np.minimum(sell_strength, 1.0)
     
     def analyze_all_stocks(self):
         """Analyze all stocks and generate momentum signals"""
@@ -215,50 +133,51 @@ class MomentumAlgorithms:
         
         # Suppress intermediate output - will be shown in combined analysis only
         
-        results = []
-        processed = 0
-        
-        for symbol in self.popular_stocks:
+        if self.price_cache is None:
+            # One bulk request for the whole universe instead of one per symbol
+            self.price_cache = download_price_history(self.popular_stocks, self.start_date, self.end_date,
+                                                      cache_dir=os.path.join(self.output_dir, 'prices'))
+        
+        # Load and compute indicators on worker threads: symbols the bulk request missed download
+        # concurrently, the compiled kernels run without the GIL, and map keeps stock-list order
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+            loaded = list(executor.map(self._load_indicators, self.popular_stocks))
+        
+        # Latest/previous indicator values per stock, filled row by row
+        latest = np.empty((len(self.popular_stocks), len(SNAPSHOT_COLUMNS)))
+        prev = np.empty_like(latest)
+        symbols = []
+        for symbol, (data, snapshot) in zip(self.popular_stocks, loaded):
             # Silent processing for cleaner output
             
-            data = self.fetch_stock_data(symbol)
-            if data is None:
-                continue
-            
-            data = self.calculate_momentum_indicators(data)
-            if data is None:
+            if snapshot is None:
                 continue
             
-            buy_strength, sell_strength = self.calculate_momentum_signal_strength(data)
-            if buy_strength is None:
-                continue
-            
-            self.stock_data[symbol] = data
-            latest = data.iloc[-1]
-            
-            results.append({
-                'Symbol': symbol,
-                'Current_Price': latest['Close'],
-                'Momentum_Buy_Signal': buy_strength,
-                'Momentum_Sell_Signal': sell_strength,
-                'RSI': latest['RSI'],
-                'MACD': latest['MACD'],
-                'MACD_Signal': latest['MACD_Signal'],
-                'MACD_Histogram': latest['MACD_Histogram'],
-                'ROC_5': latest['ROC_5'],
-                'ROC_20': latest['ROC_20'],
-                'Price_vs_SMA10': latest['Price_vs_SMA10'],
-                'Price_vs_SMA20': latest['Price_vs_SMA20'],
-                'Price_vs_SMA50': latest['Price_vs_SMA50'],
-                'Volume_Momentum': latest['Volume_Momentum']
-            })
-            
-            processed += 1
-            time.sleep(0.02)
+            # Keep only recent closes for charting; indicator series are not retained
+            self.stock_data[symbol] = data.iloc[-PLOT_BARS:][['Close']]
+            row = len(symbols)
+            prev[row] = snapshot[:, 0]
+            latest[row] = snapshot[:, 1]
+            symbols.append(symbol)
+        
+        if not symbols:
+            self.signals_df = pd.DataFrame()
+            return self.signals_df
+        
+        # Score every stock in one vectorized pass over the stacked last two bars
+        latest = latest[:len(symbols)]
+        prev = prev[:len(symbols)]
+        buy_strength, sell_strength = self.score_momentum_signals(latest, prev)
         
         # Momentum analysis complete - results ready for processing
         
-        self.signals_df = pd.DataFrame(results)
+        self.signals_df = pd.DataFrame({
+            'Symbol': symbols,
+            'Current_Price': latest[:, SNAPSHOT_INDEX['Close']],
+            'Momentum_Buy_Signal': buy_strength,
+            'Momentum_Sell_Signal': sell_strength,
+            **{name: latest[:, SNAPSHOT_INDEX[name]] for name in RESULT_COLUMNS}
+        })
         return self.signals_df
     
     def get_top_momentum_signals(self, top_n=15):
@@ -266,8 +185,9 @@ class MomentumAlgorithms:
         if self.signals_df is None:
             return None, None
         
-        top_momentum_buys = self.signals_df.nlargest(top_n, 'Momentum_Buy_Signal')
-        top_momentum_sells = self.signals_df.nlargest(top_n, 'Momentum_Sell_Signal')
+        # Partition-based selection, same rows and order as nlargest
+        top_momentum_buys = nlargest_rows(self.signals_df, top_n, 'Momentum_Buy_Signal')
+        top_momentum_sells = nlargest_rows(self.signals_df, top_n, 'Momentum_Sell_Signal')
         
         return top_momentum_buys, top_momentum_sells
     
@@ -277,7 +197,8 @@ class MomentumAlgorithms:
             print("Momentum-Based Stock Analysis")
             print("=" * 60)
         
-        self.fetch_dynamic_stock_list(force_refresh=force_refresh_stocks)
+        if force_refresh_stocks or not self.popular_stocks:
+            self.fetch_dynamic_stock_list(force_refresh=force_refresh_stocks)
         signals_df = self.analyze_all_stocks()
         
         if signals_df is None or len(signals_df) == 0:
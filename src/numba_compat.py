@@ -0,0 +1,29 @@
+"""
+Optional Numba support.
+
+Kernels decorate themselves with ``njit`` and loop with ``prange``. When Numba
+is not installed both degrade gracefully: ``njit`` becomes a no-op decorator
+and ``prange`` is plain ``range``, so the same code runs as ordinary Python.
+
+Kernels that pass ``cache=True`` are compiled once and reloaded from
+output/.numba_cache on later runs (override with NUMBA_CACHE_DIR).
+"""
+
+import os
+
+# Must be set before numba is imported; keeps the compiled kernels with the other cached run
+# data, so they survive a cleaned __pycache__ or a read-only source tree
+os.environ.setdefault('NUMBA_CACHE_DIR', os.path.abspath(os.path.join('output', '.numba_cache')))
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (supports bare and parameterised use)"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
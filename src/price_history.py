@@ -0,0 +1,177 @@
+"""
+Shared price history download.
+
+Keeps each symbol's daily Close/Volume history in <cache_dir>/<symbol>.parquet
+and only asks Yahoo for the bars added since the last run, batching every
+symbol that needs the same date range into one bulk yfinance request.
+Histories of symbols that have left the stock list are pruned after a week.
+
+All Yahoo requests go through one shared HTTP session so connections (and
+their TLS handshakes) are reused across downloads.
+"""
+
+import os
+import json
+import time
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+# The only columns the strategies read
+PRICE_COLUMNS = ['Close', 'Volume']
+
+# {symbol: earliest start date its cached history was downloaded from}
+COVERAGE_FILE = 'coverage.json'
+
+# Cached symbols that drop out of the stock list are deleted once untouched for this many seconds
+CACHE_MAX_AGE = 7 * 24 * 60 * 60
+
+# Connection pool size for the shared Yahoo session (matches the fetch thread count)
+POOL_SIZE = 32
+
+@lru_cache(maxsize=1)
+def yahoo_session():
+    """Shared HTTP session for yfinance; without one, every yf.download call opens a new session"""
+    try:
+        # yfinance >= 0.2.55 expects a browser-impersonating curl_cffi session
+        from curl_cffi import requests as curl_requests
+        return curl_requests.Session(impersonate='chrome')
+    except ImportError:
+        import requests
+        from requests.adapters import HTTPAdapter
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+def _bulk_download(symbols, start, end):
+    """Fetch {symbol: Close/Volume DataFrame} for [start, end) in one multi-ticker request"""
+    try:
+        data = yf.download(symbols, start=start.strftime('%Y-%m-%d'), end=end.strftime('%Y-%m-%d'),
+                           group_by='ticker', threads=True, progress=False, session=yahoo_session())
+    except Exception as e:
+        print(f"Error downloading price history: {e}")
+        return {}
+    if data is None or len(data) == 0:
+        return {}
+
+    if not isinstance(data.columns, pd.MultiIndex):
+        # Single-ticker downloads come back without the ticker level
+        data = pd.concat({symbols[0]: data}, axis=1)
+
+    prices = {}
+    for symbol in data.columns.get_level_values(0).unique():
+        symbol_data = data[symbol][PRICE_COLUMNS].dropna(how='all')
+        if len(symbol_data) > 0:
+            prices[symbol] = symbol_data
+    return prices
+
+def _load_coverage(cache_dir):
+    """Read the coverage index (empty if missing or unreadable)"""
+    try:
+        with open(os.path.join(cache_dir, COVERAGE_FILE), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _read_cached(cache_dir, symbol):
+    """Cached Close/Volume history for a symbol, or None"""
+    try:
+        return pd.read_parquet(os.path.join(cache_dir, f'{symbol}.parquet'), columns=PRICE_COLUMNS)
+    except (ImportError, ValueError, OSError):
+        return None
+
+def _write_cached(cache_dir, symbol, frame):
+    """Store a symbol's history; returns False if it could not be written"""
+    path = os.path.join(cache_dir, f'{symbol}.parquet')
+    try:
+        # zstd gives noticeably smaller files than the default snappy at similar read speed
+        frame.to_parquet(path + '.tmp', compression='zstd')
+        os.replace(path + '.tmp', path)
+        return True
+    except (ImportError, ValueError, OSError):
+        return False
+
+def _prune_cached(cache_dir, coverage, keep):
+    """Delete cached histories of symbols outside keep that have not been written for CACHE_MAX_AGE; returns True if any were"""
+    cutoff = time.time() - CACHE_MAX_AGE
+    pruned = False
+    for symbol in [symbol for symbol in coverage if symbol not in keep]:
+        path = os.path.join(cache_dir, f'{symbol}.parquet')
+        try:
+            if os.path.getmtime(path) >= cutoff:
+                continue
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            continue
+        del coverage[symbol]
+        pruned = True
+    return pruned
+
+def download_price_history(symbols, start_date, end_date, cache_dir=None):
+    """Fetch {symbol: Close/Volume DataFrame} from start_date to end_date, downloading only what cache_dir lacks"""
+    start = pd.Timestamp(start_date.date())
+    end = pd.Timestamp(end_date.date())
+    coverage = _load_coverage(cache_dir) if cache_dir else {}
+
+    prices = {}
+    pending = {}  # first date still needed -> symbols
+    for symbol in symbols:
+        covered = symbol in coverage and pd.Timestamp(coverage[symbol]) <= start
+        cached = _read_cached(cache_dir, symbol) if covered else None
+        if cached is None or len(cached) == 0:
+            pending.setdefault(start, []).append(symbol)
+            continue
+
+        prices[symbol] = cached
+        last = cached.index[-1]
+        # No new bar can exist unless a weekday has closed since the last cached one
+        if len(pd.bdate_range(last + pd.Timedelta(days=1), end - pd.Timedelta(days=1))) == 0:
+            continue
+        # Ask for the last cached bar again to detect split/dividend re-adjustments
+        pending.setdefault(last, []).append(symbol)
+
+    updated = {}  # symbol -> (history, date it is complete from)
+    refetch = []
+    for fetch_start, group in pending.items():
+        fresh = _bulk_download(group, fetch_start, end)
+        for symbol in group:
+            new = fresh.get(symbol)
+            if new is None:
+                continue
+            old = prices.get(symbol)
+            if old is not None:
+                # Incremental update: the overlapping bar must still match, else history was re-adjusted
+                if fetch_start not in new.index or not np.isclose(new.at[fetch_start, 'Close'],
+                                                                  old.at[fetch_start, 'Close'], rtol=1e-6):
+                    refetch.append(symbol)
+                    continue
+                updated[symbol] = (pd.concat([old, new.loc[new.index > fetch_start]]), coverage[symbol])
+            else:
+                updated[symbol] = (new, start.strftime('%Y-%m-%d'))
+
+    if refetch:
+        for symbol, new in _bulk_download(refetch, start, end).items():
+            updated[symbol] = (new, start.strftime('%Y-%m-%d'))
+
+    pruned = _prune_cached(cache_dir, coverage, set(symbols)) if cache_dir else False
+    if cache_dir and (updated or pruned):
+        os.makedirs(cache_dir, exist_ok=True)
+        for symbol, (frame, covered_from) in updated.items():
+            if _write_cached(cache_dir, symbol, frame):
+                coverage[symbol] = covered_from
+        try:
+            with open(os.path.join(cache_dir, COVERAGE_FILE + '.tmp'), 'w') as f:
+                json.dump(coverage, f)
+            os.replace(os.path.join(cache_dir, COVERAGE_FILE + '.tmp'), os.path.join(cache_dir, COVERAGE_FILE))
+        except OSError:
+            pass
+    for symbol, (frame, _) in updated.items():
+        prices[symbol] = frame
+
+    start_str = start.strftime('%Y-%m-%d')
+    return {symbol: prices[symbol].loc[start_str:] for symbol in symbols if symbol in prices}
@@ -0,0 +1,28 @@
+"""
+Top-N selection for signal tables.
+
+Finds the n largest values with an O(N) partition instead of a full sort and
+returns rows in exactly the order DataFrame.nlargest would.
+"""
+
+import numpy as np
+
+def top_n_positions(values, n):
+    """Row positions of the n largest values, ordered like DataFrame.nlargest (ties keep first)"""
+    if n <= 0:
+        return np.empty(0, dtype=np.intp)
+    missing = np.isnan(values)
+    positions = np.flatnonzero(~missing)
+    if len(positions) > n:
+        candidates = values[positions]
+        kth = np.partition(candidates, len(candidates) - n)[len(candidates) - n]
+        above = positions[candidates > kth]
+        ties = positions[candidates == kth][:n - len(above)]
+        positions = np.concatenate([above, ties])
+    positions = positions[np.lexsort((positions, -values[positions]))]
+    # Like nlargest, NaN rows only fill in when there are fewer than n real values
+    return np.concatenate([positions, np.flatnonzero(missing)[:n - len(positions)]])
+
+def nlargest_rows(frame, n, column):
+    """Same rows, in the same order, as frame.nlargest(n, column)"""
+    return frame.iloc[top_n_positions(frame[column].to_numpy(dtype=float), n)]